@@ -16,11 +16,18 @@ SERVICE_ACCOUNT_DRIVE_READER = os.getenv(
     "SERVICE_ACCOUNT_CREDENTIALS_DRIVE_READER")
 DRIVE_READ_SCOPES = ["https://www.googleapis.com/auth/drive.readonly"]
 
+# Extraction Model Endpoint (JSON batch protocol, see v2/extraction/model_client.py)
+EXTRACTION_ENDPOINT = os.getenv("EXTRACTION_ENDPOINT")
+
 # Local Pipeline Stages (Past Tense)
 BASE_OUTPUT_DIR = Path("pipeline_output")
 DISCOVERED_DIR = BASE_OUTPUT_DIR / "discovered"
 CONVERTED_DIR = BASE_OUTPUT_DIR / "converted"
 SCOPED_DIR = BASE_OUTPUT_DIR / "scoped"
+INDEXED_DIR = BASE_OUTPUT_DIR / "indexed"
+THUMBNAILS_DIR = BASE_OUTPUT_DIR / "thumbnails"
+EXTRACTED_DIR = BASE_OUTPUT_DIR / "extracted"
+EXPORTED_DIR = BASE_OUTPUT_DIR / "exported"
 
 # Scoped Branch 1: Forensic Status
 SCOPED_STATUS_DIR = SCOPED_DIR / "date_parse_status"
@@ -32,6 +39,23 @@ SCOPED_STATUS_CONFLICT_DIR = SCOPED_STATUS_DIR / "date_parse_scope_conflict"
 # Scoped Branch 2: Working Set
 SCOPED_FULLY_SCOPED_DIR = SCOPED_DIR / "fully_scoped"
 
+# Indexed: Inverted full-text and field index over the converted corpus
+INDEX_DB_PATH = INDEXED_DIR / "index.sqlite"
+
+# Thumbnails: Content-addressed render cache and contact sheet
+THUMBNAILS_CACHE_DIR = THUMBNAILS_DIR / "cache"
+THUMBNAILS_MANIFEST_PATH = THUMBNAILS_DIR / "manifest.json"
+THUMBNAILS_CONTACT_SHEET_PATH = THUMBNAILS_DIR / "index.html"
+
+# Extracted: Per-document results plus a response cache keyed by content hash
+EXTRACTED_RESULTS_DIR = EXTRACTED_DIR / "results"
+EXTRACTION_CACHE_DIR = EXTRACTED_DIR / "cache"
+
+# Exported: Queryable invoice dataset (SQLite + columnar)
+EXPORT_DB_PATH = EXPORTED_DIR / "invoices.sqlite"
+EXPORT_PARQUET_PATH = EXPORTED_DIR / "invoices.parquet"
+EXPORT_TABLE_ROWS_PARQUET_PATH = EXPORTED_DIR / "table_rows.parquet"
+
 # Project-wide constraints
 IN_SCOPE_START_DATE = date(2021, 1, 1)
 
@@ -39,4 +63,8 @@ IN_SCOPE_START_DATE = date(2021, 1, 1)
 TMP_DIR = Path("tmp")
 EXPLORATION_DIR = TMP_DIR / "doc_inspector"
 EXPLORATION_DOCS_DIR = EXPLORATION_DIR / "docs"
-EXPLORATION_THUMBNAILS_DIR = EXPLORATION_DIR / "thumbnails"
+EXPLORATION_REPORTS_DIR = EXPLORATION_DIR / "reports"
+CONFORMANCE_DIR = TMP_DIR / "conformance"
+EXTRACTION_STUB_DIR = TMP_DIR / "extraction_stub"
+EXTRACTION_STUB_RESULTS_DIR = EXTRACTION_STUB_DIR / "results"
+EXTRACTION_STUB_CACHE_DIR = EXTRACTION_STUB_DIR / "cache"
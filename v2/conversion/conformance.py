@@ -0,0 +1,133 @@
+"""Native Backend Conformance: Diffs the in-process reader against antiword.
+
+Runs both conversion backends over the corpus, reports how many documents
+produce identical bracketed text, and writes a unified diff per mismatch to
+the /tmp directory. The --benchmark mode instead times each backend over the
+same files and reports throughput.
+"""
+
+import argparse
+import difflib
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from v2.common import constants
+from v2.conversion import doc_parser, engine, word_binary
+
+
+def _list_docs(source_dir, limit):
+    """Returns the sorted .doc files in source_dir, skipping temp Word files."""
+    doc_paths = sorted(
+        p for p in source_dir.iterdir()
+        if p.suffix.lower() == ".doc" and not p.name.startswith("~"))
+    return doc_paths[:limit] if limit else doc_paths
+
+
+def run_conformance(doc_paths, show=5):
+    """Converts each file with both backends and diffs the results."""
+    print("--- [ CONFORMANCE: native vs antiword ] ---")
+    constants.CONFORMANCE_DIR.mkdir(parents=True, exist_ok=True)
+
+    counts = {"match": 0, "mismatch": 0, "unsupported": 0, "antiword_failed": 0}
+    shown = 0
+
+    for doc_path in doc_paths:
+        try:
+            expected = engine.convert_with_antiword(doc_path)
+        except (subprocess.CalledProcessError, FileNotFoundError):
+            counts["antiword_failed"] += 1
+            continue
+
+        try:
+            actual = doc_parser.convert_doc_native(doc_path)
+        except word_binary.UnsupportedDocumentError as e:
+            print(f"Unsupported: {doc_path.name} ({e})")
+            counts["unsupported"] += 1
+            continue
+        except Exception as e:
+            actual = f"Error: native backend raised {type(e).__name__}: {e}"
+
+        if actual == expected:
+            counts["match"] += 1
+            continue
+
+        counts["mismatch"] += 1
+        diff = list(difflib.unified_diff(
+            expected.splitlines(), actual.splitlines(),
+            fromfile=f"antiword/{doc_path.name}", tofile=f"native/{doc_path.name}",
+            lineterm=""))
+        with open(constants.CONFORMANCE_DIR / f"{doc_path.stem}.diff", "w",
+                  encoding="utf-8") as f:
+            f.write("\n".join(diff) + "\n")
+        if shown < show:
+            print("\n".join(diff[:40]))
+            shown += 1
+
+    compared = counts["match"] + counts["mismatch"]
+    rate = (counts["match"] / compared * 100) if compared else 0.0
+    print(f"\nConformance Complete.")
+    print(f"Identical:                {counts['match']} ({rate:.1f}%)")
+    print(f"Different:                {counts['mismatch']} (diffs in {constants.CONFORMANCE_DIR})")
+    print(f"Unsupported (native):     {counts['unsupported']}")
+    if counts["antiword_failed"] > 0:
+        print(f"Skipped (antiword error): {counts['antiword_failed']}")
+    print("-" * 25)
+
+
+def _time_backend(doc_paths, convert):
+    """Returns (elapsed_seconds, converted_count) for a conversion function."""
+    converted_count = 0
+    start = time.perf_counter()
+    for doc_path in doc_paths:
+        try:
+            convert(doc_path)
+            converted_count += 1
+        except Exception:
+            continue
+    return time.perf_counter() - start, converted_count
+
+
+def run_benchmark(doc_paths):
+    """Times both backends sequentially over the same files."""
+    print("--- [ BENCHMARK: native vs antiword ] ---")
+    total_mb = sum(p.stat().st_size for p in doc_paths) / (1024 * 1024)
+    print(f"Corpus: {len(doc_paths)} files, {total_mb:.1f} MB")
+
+    backends = [
+        ("antiword", engine.convert_with_antiword),
+        ("native", doc_parser.convert_doc_native),
+    ]
+    for name, convert in backends:
+        elapsed, converted_count = _time_backend(doc_paths, convert)
+        files_per_sec = converted_count / elapsed if elapsed else 0.0
+        mb_per_sec = total_mb / elapsed if elapsed else 0.0
+        print(f"{name:<10} {elapsed:8.2f} s  {files_per_sec:8.1f} files/s  "
+              f"{mb_per_sec:6.1f} MB/s  ({converted_count}/{len(doc_paths)} converted)")
+    print("-" * 25)
+
+
+def main():
+    """Command line entry point for conformance checks and benchmarks."""
+    parser = argparse.ArgumentParser(
+        description="Compare the native Word reader against antiword.")
+    parser.add_argument("--source-dir", type=Path, default=constants.DISCOVERED_DIR,
+                        help="Directory of .doc files (default: discovered mirror).")
+    parser.add_argument("--limit", type=int, default=None,
+                        help="Only process the first N files.")
+    parser.add_argument("--show", type=int, default=5,
+                        help="Number of mismatching diffs to print.")
+    parser.add_argument("--benchmark", action="store_true",
+                        help="Measure throughput of both backends instead of diffing.")
+    args = parser.parse_args()
+
+    if not args.source_dir.is_dir():
+        print(f"Error: Source directory not found: {args.source_dir}")
+        sys.exit(1)
+
+    doc_paths = _list_docs(args.source_dir, args.limit)
+    if args.benchmark:
+        run_benchmark(doc_paths)
+    else:
+        run_conformance(doc_paths, show=args.show)
@@ -3,24 +3,73 @@
 import xml.etree.ElementTree as ET
 import olefile
 
+from v2.conversion import word_binary
+
+def _read_ole_metadata(ole, meta_info):
+    """Adds creation and modification times from an open OLE2 file to meta_info."""
+    meta = ole.get_metadata()
+    if meta.create_time:
+        meta_info["create_time"] = meta.create_time.isoformat()
+    if meta.last_saved_time:
+        meta_info["last_saved_time"] = meta.last_saved_time.isoformat()
+    return meta_info
+
 def get_ole_metadata(file_path):
     """Extracts creation and modification times from OLE2 metadata."""
     meta_info = {"filename": file_path.name}
     try:
         if olefile.isOleFile(file_path):
             with olefile.OleFileIO(file_path) as ole:
-                meta = ole.get_metadata()
-                if meta.create_time:
-                    meta_info["create_time"] = meta.create_time.isoformat()
-                if meta.last_saved_time:
-                    meta_info["last_saved_time"] = meta.last_saved_time.isoformat()
+                _read_ole_metadata(ole, meta_info)
     except Exception as e:
         print(f"Warning: Could not read OLE metadata for {file_path}: {e}")
     return meta_info
 
+def unwrap_thumbnail(data):
+    """Strips the 16-byte clipboard wrapper (starts with ffffffff) from a WMF thumbnail."""
+    if isinstance(data, bytes) and data.startswith(b'\xff\xff\xff\xff'):
+        return data[16:]
+    return data
+
+def get_ole_thumbnail(file_path):
+    """Returns the raw WMF thumbnail bytes from OLE2 metadata, or None."""
+    if not olefile.isOleFile(file_path):
+        return None
+    with olefile.OleFileIO(file_path) as ole:
+        thumbnail = ole.get_metadata().thumbnail
+    return unwrap_thumbnail(thumbnail) if thumbnail else None
+
+def _format_metadata_header(metadata):
+    """Returns the metadata header lines, filename first, then sorted keys."""
+    output = ["--- METADATA START ---"]
+    if "filename" in metadata:
+        output.append(f"filename: {metadata['filename']}")
+    for key in sorted(metadata.keys()):
+        if key != "filename":
+            output.append(f"{key}: {metadata[key]}")
+    output.append("--- METADATA END ---\n")
+    return output
+
+def _format_table(rows):
+    """Formats rows of raw cell strings as bracketed table lines."""
+    output = ["\n--- TABLE START ---"]
+    for row in rows:
+        row_content = []
+        for raw_cell in row:
+            # Split into lines and clean
+            cleaned_lines = [
+                " ".join(line.split()).strip()
+                for line in raw_cell.splitlines() if line.strip()
+            ]
+            cell_text = " <br> ".join(cleaned_lines)
+            row_content.append(f"[ {cell_text if cell_text else 'EMPTY'} ]")
+        output.append(" ".join(row_content))
+    output.append("--- TABLE END ---\n")
+    return output
+
 def transform_xml_to_bracketed(xml_string, metadata=None):
     """Parses antiword DocBook XML and returns a bracketed text representation.
-    
+
     Args:
         xml_string: The raw XML string from antiword -x db.
         metadata: Optional dictionary of OLE metadata to include as a header.
@@ -28,16 +77,9 @@ def transform_xml_to_bracketed(xml_string, metadata=None):
         A string containing metadata header, paragraphs, and bracketed table rows.
     """
     output = []
-    
+
     if metadata:
-        output.append("--- METADATA START ---")
-        # Filename first, then sorted keys
-        if "filename" in metadata:
-            output.append(f"filename: {metadata['filename']}")
-        for key in sorted(metadata.keys()):
-            if key != "filename":
-                output.append(f"{key}: {metadata[key]}")
-        output.append("--- METADATA END ---\n")
+        output.extend(_format_metadata_header(metadata))
 
     try:
         root = ET.fromstring(xml_string)
@@ -47,20 +89,11 @@ def transform_xml_to_bracketed(xml_string, metadata=None):
 
         def _handle_table(table_element):
             """Internal helper to format informaltable as bracketed rows."""
-            output.append("\n--- TABLE START ---")
-            for row in table_element.findall(".//row"):
-                row_content = []
-                for entry in row.findall("entry"):
-                    # Split into lines and clean
-                    raw_lines = "".join(entry.itertext()).splitlines()
-                    cleaned_lines = [
-                        " ".join(line.split()).strip() 
-                        for line in raw_lines if line.strip()
-                    ]
-                    cell_text = " <br> ".join(cleaned_lines)
-                    row_content.append(f"[ {cell_text if cell_text else 'EMPTY'} ]")
-                output.append(" ".join(row_content))
-            output.append("--- TABLE END ---\n")
+            rows = [
+                ["".join(entry.itertext()) for entry in row.findall("entry")]
+                for row in table_element.findall(".//row")
+            ]
+            output.extend(_format_table(rows))
 
         # Iterate through chapter children
         for element in chapter:
@@ -74,7 +107,51 @@ def transform_xml_to_bracketed(xml_string, metadata=None):
                         output.append(text)
             elif element.tag == "informaltable":
                 _handle_table(element)
-            
+
         return "\n".join(output)
     except Exception as e:
         return "\n".join(output) + f"\nError parsing XML for bracketed view: {e}"
+
+def transform_blocks_to_bracketed(blocks, metadata=None):
+    """Formats word_binary blocks with the same layout as transform_xml_to_bracketed.
+
+    Args:
+        blocks: List of ("para", text) and ("table", rows) tuples.
+        metadata: Optional dictionary of OLE metadata to include as a header.
+    Returns:
+        A string containing metadata header, paragraphs, and bracketed table rows.
+    """
+    output = []
+
+    if metadata:
+        output.extend(_format_metadata_header(metadata))
+
+    for kind, content in blocks:
+        if kind == "table":
+            output.extend(_format_table(content))
+        else:
+            text = content.strip()
+            if text:
+                output.append(text)
+
+    return "\n".join(output)
+
+def convert_doc_native(file_path):
+    """Converts a .doc file to bracketed text without spawning antiword.
+
+    The OLE2 container is opened once and used for both the metadata header
+    and the WordDocument/table streams.
+
+    Raises:
+        word_binary.UnsupportedDocumentError: If the file cannot be read natively.
+    """
+    if not olefile.isOleFile(file_path):
+        raise word_binary.UnsupportedDocumentError("Not a valid OLE2 file")
+    with olefile.OleFileIO(file_path) as ole:
+        metadata = {"filename": file_path.name}
+        try:
+            _read_ole_metadata(ole, metadata)
+        except Exception as e:
+            print(f"Warning: Could not read OLE metadata for {file_path}: {e}")
+        blocks = word_binary.extract_blocks(ole)
+    return transform_blocks_to_bracketed(blocks, metadata=metadata)
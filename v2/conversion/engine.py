@@ -1,12 +1,45 @@
 """Stage: Conversion logic (.doc -> Bracketed Text)."""
 
+import argparse
 import subprocess
 from v2.common import constants
-from v2.conversion import doc_parser
+from v2.conversion import doc_parser, word_binary
 
-def run_conversion():
-    """Converts all local .doc originals to bracketed text files."""
-    print("--- [ STAGE: CONVERSION ] ---")
+BACKENDS = ["antiword", "native"]
+
+def convert_with_antiword(doc_path):
+    """Converts a .doc file to bracketed text via antiword's DocBook output."""
+    metadata = doc_parser.get_ole_metadata(doc_path)
+    result = subprocess.run(
+        ["antiword", "-x", "db", str(doc_path)],
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    return doc_parser.transform_xml_to_bracketed(result.stdout, metadata=metadata)
+
+def convert_doc(doc_path, backend="antiword"):
+    """Converts a .doc file to bracketed text with the selected backend.
+
+    Returns:
+        Tuple of (bracketed_text, fell_back), where fell_back is True if the
+        native backend could not read the file and antiword was used instead.
+    """
+    if backend == "native":
+        try:
+            return doc_parser.convert_doc_native(doc_path), False
+        except word_binary.UnsupportedDocumentError:
+            return convert_with_antiword(doc_path), True
+    return convert_with_antiword(doc_path), False
+
+def run_conversion(backend="antiword"):
+    """Converts all local .doc originals to bracketed text files.
+
+    Args:
+        backend: "antiword" (subprocess + DocBook XML) or "native" (in-process
+            Word binary reader, falling back to antiword for unsupported files).
+    """
+    print(f"--- [ STAGE: CONVERSION ({backend}) ] ---")
     
     if not constants.DISCOVERED_DIR.exists():
         print("Error: Discovered directory not found.")
@@ -23,6 +56,7 @@ def run_conversion():
     temp_skip_count = 0
     unsupported_skip_count = 0
     error_count = 0
+    fallback_count = 0
     
     for doc_path in all_files:
         # 1. Skip non-DOC files
@@ -46,15 +80,9 @@ def run_conversion():
                     continue
             
         try:
-            metadata = doc_parser.get_ole_metadata(doc_path)
-            result = subprocess.run(
-                ["antiword", "-x", "db", str(doc_path)],
-                capture_output=True,
-                text=True,
-                check=True
-            )
-            bracketed_text = doc_parser.transform_xml_to_bracketed(
-                result.stdout, metadata=metadata)
+            bracketed_text, fell_back = convert_doc(doc_path, backend)
+            if fell_back:
+                fallback_count += 1
             
             with open(dest_path, "w", encoding="utf-8") as f:
                 f.write(bracketed_text)
@@ -75,6 +103,21 @@ def run_conversion():
     print(f"Skipped (Already Exists): {exists_skip_count}")
     print(f"Skipped (Temp Word Files): {temp_skip_count}")
     print(f"Skipped (Unsupported):     {unsupported_skip_count}")
+    if fallback_count > 0:
+        print(f"Native Fallback (antiword): {fallback_count}")
     if error_count > 0:
         print(f"Failed:                   {error_count}")
     print("-" * 25)
+
+def main():
+    """Command line entry point for the conversion stage."""
+    parser = argparse.ArgumentParser(
+        description="Convert discovered .doc files to bracketed text.")
+    parser.add_argument(
+        "--conversion-backend",
+        choices=BACKENDS,
+        default="antiword",
+        help="Word extraction backend (default: antiword)"
+    )
+    args = parser.parse_args()
+    run_conversion(backend=args.conversion_backend)
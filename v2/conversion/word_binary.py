@@ -0,0 +1,334 @@
+"""In-process reader for Word 97-2003 binary documents (OLE2 WordDocument stream).
+
+Reconstructs the main document text from the piece table (CLX) and uses the
+paragraph properties stored in the PAPX FKPs to recover table structure, so
+the result can be formatted exactly like antiword's DocBook output.
+
+Only the parts of [MS-DOC] needed for paragraphs and tables are implemented;
+Word 6/95 and encrypted files raise UnsupportedDocumentError.
+"""
+
+import bisect
+import struct
+
+_FIB_IDENT = 0xA5EC
+_MIN_NFIB = 106  # Word 97 and later; Word 6/95 use an incompatible FIB.
+_FIB_BASE_SIZE = 32
+_FLAG_WHICH_TABLE = 0x0200
+_FLAG_ENCRYPTED = 0x0100
+
+# Indices into FibRgFcLcb97 (pairs of fc/lcb).
+_FC_PLCF_BTE_PAPX = 13
+_FC_CLX = 33
+
+_FKP_SIZE = 512
+_BX_PAP_SIZE = 13
+
+# Paragraph sprms that describe table membership.
+_SPRM_P_IN_TABLE = 0x2416
+_SPRM_P_TTP = 0x2417
+_SPRM_P_ITAP = 0x6649
+_SPRM_P_INNER_TTP = 0x244C
+_SPRM_T_DEF_TABLE = 0xD608
+_SPRM_T_DEF_TABLE_10 = 0xD606
+_SPRM_P_CHG_TABS = 0xC615
+
+# Operand size by spra (top 3 bits of the sprm); 6 is variable length.
+_SPRA_OPERAND_SIZES = {0: 1, 1: 1, 2: 2, 3: 4, 4: 2, 5: 2, 7: 3}
+
+_PARAGRAPH_END = "\r"
+_CELL_END = "\x07"
+
+_FIELD_BEGIN = "\x13"
+_FIELD_SEPARATOR = "\x14"
+_FIELD_END = "\x15"
+
+# Special characters mapped the way antiword renders them; other control
+# characters (pictures, footnote/annotation anchors) are dropped.
+_CHAR_MAP = {
+    "\x0b": "\n",  # Vertical tab: manual line break.
+    "\x0e": "\n",  # Column break.
+    "\x1e": "-",  # Non-breaking hyphen.
+    "\xa0": " ",  # Non-breaking space.
+    "\t": "\t",
+}
+
+
+class UnsupportedDocumentError(Exception):
+    """Raised when a document cannot be read by the native backend."""
+
+
+def _read_fib(word):
+    """Returns (table_stream_name, ccp_text, fc_lcb) from the FIB.
+
+    fc_lcb is a function mapping a FibRgFcLcb97 index to its (fc, lcb) pair.
+    """
+    if len(word) < _FIB_BASE_SIZE + 2:
+        raise UnsupportedDocumentError("WordDocument stream too short")
+    ident, nfib = struct.unpack_from("<HH", word, 0)
+    if ident != _FIB_IDENT:
+        raise UnsupportedDocumentError("Not a Word binary document")
+    if nfib < _MIN_NFIB:
+        raise UnsupportedDocumentError(f"Unsupported Word version (nFib={nfib})")
+
+    flags = struct.unpack_from("<H", word, 0x0A)[0]
+    if flags & _FLAG_ENCRYPTED:
+        raise UnsupportedDocumentError("Encrypted document")
+    table_name = "1Table" if flags & _FLAG_WHICH_TABLE else "0Table"
+
+    # FibBase, then the variable-length fibRgW, fibRgLw and fibRgFcLcb blocks.
+    pos = _FIB_BASE_SIZE
+    csw = struct.unpack_from("<H", word, pos)[0]
+    pos += 2 + csw * 2
+    cslw = struct.unpack_from("<H", word, pos)[0]
+    pos += 2
+    ccp_text = struct.unpack_from("<i", word, pos + 3 * 4)[0]
+    pos += cslw * 4
+    cb_rg_fc_lcb = struct.unpack_from("<H", word, pos)[0]
+    pos += 2
+    if cb_rg_fc_lcb <= _FC_CLX:
+        raise UnsupportedDocumentError("FIB has no piece table entry")
+
+    def fc_lcb(index):
+        return struct.unpack_from("<II", word, pos + index * 8)
+
+    return table_name, ccp_text, fc_lcb
+
+
+def _read_pieces(table, fc_clx, lcb_clx):
+    """Parses the CLX into a list of (cp_start, cp_end, fc, compressed) pieces."""
+    clx = table[fc_clx:fc_clx + lcb_clx]
+    pos = 0
+    while pos < len(clx):
+        clxt = clx[pos]
+        if clxt == 0x01:
+            # Prc: skip the property modifiers, only the piece table matters.
+            cb_grpprl = struct.unpack_from("<h", clx, pos + 1)[0]
+            pos += 3 + cb_grpprl
+        elif clxt == 0x02:
+            lcb = struct.unpack_from("<I", clx, pos + 1)[0]
+            plc = clx[pos + 5:pos + 5 + lcb]
+            count = (lcb - 4) // 12
+            cps = struct.unpack_from(f"<{count + 1}I", plc, 0)
+            pieces = []
+            for i in range(count):
+                fc_raw = struct.unpack_from("<I", plc, 4 * (count + 1) + 8 * i + 2)[0]
+                compressed = bool(fc_raw & 0x40000000)
+                fc = fc_raw & 0x3FFFFFFF
+                if compressed:
+                    fc //= 2
+                pieces.append((cps[i], cps[i + 1], fc, compressed))
+            return pieces
+        else:
+            raise UnsupportedDocumentError("Malformed CLX")
+    raise UnsupportedDocumentError("No piece table found")
+
+
+def _parse_paragraph_sprms(grpprl):
+    """Returns the table-related properties found in a paragraph grpprl."""
+    props = {}
+    pos = 0
+    while pos + 2 <= len(grpprl):
+        sprm = struct.unpack_from("<H", grpprl, pos)[0]
+        pos += 2
+        spra = sprm >> 13
+        if spra == 6:
+            if pos >= len(grpprl):
+                break
+            if sprm in (_SPRM_T_DEF_TABLE, _SPRM_T_DEF_TABLE_10):
+                if pos + 2 > len(grpprl):
+                    break
+                size = struct.unpack_from("<H", grpprl, pos)[0] + 1
+            elif sprm == _SPRM_P_CHG_TABS and grpprl[pos] == 255:
+                # Extended form: deleted tab positions with close zones, then additions.
+                del_count = grpprl[pos + 1] if pos + 1 < len(grpprl) else 0
+                add_pos = pos + 2 + del_count * 4
+                add_count = grpprl[add_pos] if add_pos < len(grpprl) else 0
+                size = 2 + del_count * 4 + 1 + add_count * 3
+            else:
+                size = grpprl[pos] + 1
+        else:
+            size = _SPRA_OPERAND_SIZES[spra]
+
+        operand = grpprl[pos:pos + size]
+        if len(operand) < size:
+            break
+        if sprm in (_SPRM_P_IN_TABLE, _SPRM_P_TTP, _SPRM_P_INNER_TTP):
+            props[sprm] = operand[0]
+        elif sprm == _SPRM_P_ITAP:
+            props[sprm] = struct.unpack_from("<i", operand, 0)[0]
+        pos += size
+    return props
+
+
+def _read_papx_runs(word, table, fc_plcf, lcb_plcf):
+    """Returns sorted (fc_start, fc_end, props) runs from the PAPX FKPs."""
+    plc = table[fc_plcf:fc_plcf + lcb_plcf]
+    count = (lcb_plcf - 4) // 8
+    if count <= 0:
+        return []
+    page_numbers = struct.unpack_from(f"<{count}I", plc, 4 * (count + 1))
+
+    runs = []
+    for pn in page_numbers:
+        page_offset = (pn & 0x3FFFFF) * _FKP_SIZE
+        page = word[page_offset:page_offset + _FKP_SIZE]
+        if len(page) < _FKP_SIZE:
+            continue
+        crun = page[_FKP_SIZE - 1]
+        rgfc = struct.unpack_from(f"<{crun + 1}I", page, 0)
+        for i in range(crun):
+            b_offset = page[4 * (crun + 1) + _BX_PAP_SIZE * i]
+            props = {}
+            if b_offset:
+                offset = b_offset * 2
+                cb = page[offset]
+                if cb:
+                    start, size = offset + 1, 2 * cb - 1
+                else:
+                    start, size = offset + 2, 2 * page[offset + 1]
+                # Skip the 2-byte istd preceding the grpprl.
+                props = _parse_paragraph_sprms(page[start + 2:start + size])
+            runs.append((rgfc[i], rgfc[i + 1], props))
+    runs.sort(key=lambda run: run[0])
+    return runs
+
+
+def _read_paragraphs(word, pieces, ccp_text):
+    """Yields (text, terminator, fc_of_terminator) for the main document."""
+    current = []
+    for cp_start, cp_end, fc, compressed in pieces:
+        if cp_start >= ccp_text:
+            break
+        length = min(cp_end, ccp_text) - cp_start
+        char_size = 1 if compressed else 2
+        raw = word[fc:fc + length * char_size]
+        text = raw.decode("cp1252" if compressed else "utf-16-le", errors="replace")
+
+        start = 0
+        for index, char in enumerate(text):
+            if char in (_PARAGRAPH_END, _CELL_END):
+                current.append(text[start:index])
+                yield "".join(current), char, fc + index * char_size
+                current = []
+                start = index + 1
+        current.append(text[start:])
+
+    if any(current):
+        yield "".join(current), _PARAGRAPH_END, None
+
+
+def _clean_text(text, field_stack):
+    """Maps special characters and keeps only field results, not field codes.
+
+    field_stack carries the nesting state across paragraphs; each entry is
+    True once its field separator has been seen.
+    """
+    out = []
+    for char in text:
+        if char == _FIELD_BEGIN:
+            field_stack.append(False)
+        elif char == _FIELD_SEPARATOR:
+            if field_stack:
+                field_stack[-1] = True
+        elif char == _FIELD_END:
+            if field_stack:
+                field_stack.pop()
+        elif not all(field_stack):
+            continue
+        elif char in _CHAR_MAP:
+            out.append(_CHAR_MAP[char])
+        elif char >= " ":
+            out.append(char)
+    return "".join(out)
+
+
+def _find_props(runs, run_starts, fc):
+    """Returns the paragraph properties for the run containing fc."""
+    if fc is None:
+        return {}
+    index = bisect.bisect_right(run_starts, fc) - 1
+    if index >= 0 and runs[index][0] <= fc < runs[index][1]:
+        return runs[index][2]
+    return {}
+
+
+def extract_blocks(ole):
+    """Reads an open Word document into paragraph and table blocks.
+
+    Args:
+        ole: An open olefile.OleFileIO for a Word 97-2003 document.
+    Returns:
+        List of ("para", text) and ("table", rows) tuples, where rows is a
+        list of rows and each row a list of raw cell strings with embedded
+        newlines between cell paragraphs.
+    Raises:
+        UnsupportedDocumentError: If the document cannot be read natively.
+    """
+    try:
+        return _extract_blocks(ole)
+    except (struct.error, IndexError, ValueError) as e:
+        # Truncated or malformed streams: let callers fall back to antiword.
+        raise UnsupportedDocumentError(f"Malformed document: {e}") from e
+
+
+def _extract_blocks(ole):
+    """Implements extract_blocks; structural parse errors propagate raw."""
+    if not ole.exists("WordDocument"):
+        raise UnsupportedDocumentError("No WordDocument stream")
+    word = ole.openstream("WordDocument").read()
+    table_name, ccp_text, fc_lcb = _read_fib(word)
+    if not ole.exists(table_name):
+        raise UnsupportedDocumentError(f"Missing {table_name} stream")
+    table = ole.openstream(table_name).read()
+
+    pieces = _read_pieces(table, *fc_lcb(_FC_CLX))
+    runs = _read_papx_runs(word, table, *fc_lcb(_FC_PLCF_BTE_PAPX))
+    run_starts = [run[0] for run in runs]
+
+    blocks = []
+    rows = None
+    row = []
+    cell = []
+    field_stack = []
+
+    for raw_text, terminator, fc in _read_paragraphs(word, pieces, ccp_text):
+        text = _clean_text(raw_text, field_stack)
+        props = _find_props(runs, run_starts, fc)
+        depth = props.get(_SPRM_P_ITAP) or (1 if props.get(_SPRM_P_IN_TABLE) else 0)
+
+        if depth < 1:
+            if rows is not None:
+                if row:
+                    rows.append(row)
+                blocks.append(("table", rows))
+                rows, row, cell = None, [], []
+            blocks.append(("para", text))
+            continue
+
+        if rows is None:
+            rows = []
+
+        # Row end mark of the outermost table closes the row.
+        if depth == 1 and props.get(_SPRM_P_TTP):
+            if cell:
+                row.append("\n".join(cell))
+                cell = []
+            rows.append(row)
+            row = []
+            continue
+
+        # Nested table cells are flattened into lines of the outer cell.
+        cell.append(text)
+        if terminator == _CELL_END and depth == 1:
+            row.append("\n".join(cell))
+            cell = []
+
+    if rows is not None:
+        if cell:
+            row.append("\n".join(cell))
+        if row:
+            rows.append(row)
+        blocks.append(("table", rows))
+
+    return blocks
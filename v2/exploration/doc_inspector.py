@@ -4,27 +4,41 @@ This script leverages the core pipeline logic to provide an interactive
 way to inspect original documents and their parsed representations.
 All output is stored in the /tmp directory to avoid cluttering the 
 main pipeline output.
+
+Upcoming batches are downloaded and rendered by background workers while
+the current batch is being read, and files already mirrored in the
+discovered/ directory are used in place of a fresh download.
 """
 
 import argparse
+import collections
+import concurrent.futures
 import subprocess
 import sys
+import threading
+from pathlib import Path
 
 import olefile
 
 from v2.common import auth, constants
 from v2.conversion import doc_parser
 from v2.discovery import drive_client
+from v2.indexing import search
+from v2.thumbnails import engine as thumbnails
 
+# Per-thread state; holds each worker's Drive service.
+_thread_state = threading.local()
 
-def inspect_doc(file_path, save_thumbnails=False, width=80, output_format="text"):
-    """Prints OLE2 metadata and text extracted from a .doc file."""
-    print("\n" + "=" * 80)
-    print(f"FILE: {file_path.name}")
-    print("=" * 80)
+
+def render_doc(file_path, save_thumbnails=False, width=80, output_format="text"):
+    """Returns a report of the OLE2 metadata and text extracted from a .doc file."""
+    out = []
+    out.append("\n" + "=" * 80)
+    out.append(f"FILE: {file_path.name}")
+    out.append("=" * 80)
 
     # 1. Metadata extraction via olefile.
-    print("\n--- [ OLE2 METADATA ] ---")
+    out.append("\n--- [ OLE2 METADATA ] ---")
     try:
         if olefile.isOleFile(file_path):
             with olefile.OleFileIO(file_path) as ole:
@@ -35,35 +49,30 @@ def inspect_doc(file_path, save_thumbnails=False, width=80, output_format="text"
                         continue
                     
                     if attr.lower() == "thumbnail":
-                        print(f"{attr.capitalize()}: <thumbnail-binary-blob>")
+                        out.append(f"{attr.capitalize()}: <thumbnail-binary-blob>")
                         if save_thumbnails:
-                            constants.EXPLORATION_THUMBNAILS_DIR.mkdir(
-                                parents=True, exist_ok=True)
-                            base_name = file_path.stem
-                            wmf_path = constants.EXPLORATION_THUMBNAILS_DIR / f"{base_name}.wmf"
-                            
-                            # Strip 16-byte wrapper if present (starts with ffffffff)
-                            if isinstance(val, bytes) and val.startswith(b'\xff\xff\xff\xff'):
-                                val = val[16:]
-                            
-                            with open(wmf_path, "wb") as f:
-                                f.write(val)
-                            print(f"  (Saved raw WMF: {wmf_path})")
-
-                            jpg_path = constants.EXPLORATION_THUMBNAILS_DIR / f"{base_name}.jpg"
-                            subprocess.run(["wmf2gd", "-t", "jpeg", "-o", str(jpg_path), str(wmf_path)], 
-                                         capture_output=True)
+                            # Shares the thumbnail stage's content-addressed cache,
+                            # so wmf2gd only runs for thumbnails not rendered before.
+                            digest = thumbnails.store_thumbnail(
+                                doc_parser.unwrap_thumbnail(val))
+                            jpg_path = constants.THUMBNAILS_CACHE_DIR / f"{digest}.jpg"
                             if jpg_path.exists():
-                                print(f"  (Converted to JPG: {jpg_path})")
+                                out.append(f"  (Cached JPG: {jpg_path})")
+                            else:
+                                success, info = thumbnails.render_thumbnail(digest)
+                                if success:
+                                    out.append(f"  (Converted to JPG: {jpg_path})")
+                                else:
+                                    out.append(f"  (Thumbnail render failed: {info})")
                     else:
-                        print(f"{attr.capitalize()}: {val}")
+                        out.append(f"{attr.capitalize()}: {val}")
         else:
-            print("Not a valid OLE2 file.")
+            out.append("Not a valid OLE2 file.")
     except Exception as e:
-        print(f"Error reading OLE metadata: {e}")
+        out.append(f"Error reading OLE metadata: {e}")
 
     # 2. Text extraction via antiword.
-    print(f"\n--- [ TEXT (Format: {output_format}) ] ---")
+    out.append(f"\n--- [ TEXT (Format: {output_format}) ] ---")
     try:
         if output_format in ["xml", "bracketed"]:
             cmd = ["antiword", "-x", "db", str(file_path)]
@@ -79,17 +88,141 @@ def inspect_doc(file_path, save_thumbnails=False, width=80, output_format="text"
         
         if result.returncode == 0:
             if output_format == "bracketed":
-                print(doc_parser.transform_xml_to_bracketed(result.stdout))
+                out.append(doc_parser.transform_xml_to_bracketed(result.stdout))
             else:
-                print(result.stdout)
+                out.append(result.stdout)
         else:
-            print(f"antiword returned an error: {result.stderr}")
+            out.append(f"antiword returned an error: {result.stderr}")
     except FileNotFoundError:
-        print("Error: antiword is not installed or not in PATH.")
+        out.append("Error: antiword is not installed or not in PATH.")
+    except Exception as e:
+        out.append(f"Unexpected error running antiword: {e}")
+
+    out.append("-" * 80)
+    return "\n".join(out)
+
+
+def inspect_doc(file_path, save_thumbnails=False, width=80, output_format="text"):
+    """Prints OLE2 metadata and text extracted from a .doc file."""
+    print(render_doc(file_path, save_thumbnails=save_thumbnails, width=width,
+                     output_format=output_format))
+
+
+def _get_drive_service():
+    """Returns this thread's Drive service, building it on first use.
+
+    The Drive client is not thread-safe, so each worker keeps its own
+    instead of rebuilding it (and re-reading credentials) for every file.
+    """
+    service = getattr(_thread_state, "drive_service", None)
+    if service is None:
+        service = auth.get_drive_service()
+        _thread_state.drive_service = service
+    return service
+
+
+def _resolve_doc_path(file_info):
+    """Returns a local path for the file, downloading it only if not mirrored.
+
+    The discovered/ mirror is preferred; otherwise the exploration cache is
+    used, downloading into it when the file info carries a Drive ID.
+    """
+    name = file_info["name"]
+    mirrored_path = constants.DISCOVERED_DIR / name
+    if mirrored_path.exists():
+        return mirrored_path
+
+    dest_path = constants.EXPLORATION_DOCS_DIR / name
+    if not dest_path.exists():
+        if "id" not in file_info:
+            raise FileNotFoundError(f"Not found in local mirror: {name}")
+        drive_client.download_file(_get_drive_service(), file_info["id"], dest_path)
+    return dest_path
+
+
+def _prepare_task(file_info, render_options):
+    """Worker function to fetch and render a single document.
+
+    Returns:
+        Tuple of (success, name, report_text).
+    """
+    name = file_info["name"]
+    try:
+        file_path = _resolve_doc_path(file_info)
+        return True, name, render_doc(file_path, **render_options)
     except Exception as e:
-        print(f"Unexpected error running antiword: {e}")
+        return False, name, f"Failed to prepare {name}: {e}"
+
 
-    print("-" * 80)
+def _run_interactive(files, render_options, batch_size, prefetch, workers):
+    """Shows batches one at a time while the next batches render in the background.
+
+    Files that fail to download or render are reported but do not count
+    toward the batch size.
+    """
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=workers)
+    # Keep the current batch plus the next `prefetch` batches in flight.
+    window = batch_size * (prefetch + 1)
+    pending = collections.deque()
+    next_index = 0
+    processed_count = 0
+
+    try:
+        while pending or next_index < len(files):
+            while next_index < len(files) and len(pending) < window:
+                pending.append(
+                    executor.submit(_prepare_task, files[next_index], render_options))
+                next_index += 1
+
+            success, _, report = pending.popleft().result()
+            print(report)
+            if not success:
+                continue
+            processed_count += 1
+
+            if processed_count >= batch_size and (pending or next_index < len(files)):
+                user_input = input("\n[Enter] for next batch, [q] to quit: ").strip().lower()
+                if user_input == "q":
+                    break
+                processed_count = 0
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def _write_report_task(file_info, render_options):
+    """Worker function to render a single document into the reports directory."""
+    success, name, report = _prepare_task(file_info, render_options)
+    if success:
+        report_path = constants.EXPLORATION_REPORTS_DIR / f"{Path(name).stem}.txt"
+        with open(report_path, "w", encoding="utf-8") as f:
+            f.write(report)
+    return success, name, report
+
+
+def _run_all(files, render_options, workers):
+    """Non-interactively renders every file to a report file in parallel."""
+    constants.EXPLORATION_REPORTS_DIR.mkdir(parents=True, exist_ok=True)
+    print(f"Writing {len(files)} reports to {constants.EXPLORATION_REPORTS_DIR}...")
+
+    written_count = 0
+    error_count = 0
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(_write_report_task, f, render_options) for f in files]
+
+        for future in concurrent.futures.as_completed(futures):
+            success, _, report = future.result()
+            if success:
+                written_count += 1
+                if written_count % 50 == 0:
+                    print(f"Progress: [{written_count}/{len(files)}] Reports written...")
+            else:
+                print(f"FAILED: {report}")
+                error_count += 1
+
+    print(f"\nReports Written: {written_count}")
+    if error_count > 0:
+        print(f"Failed:          {error_count}")
 
 
 def main():
@@ -103,63 +236,72 @@ def main():
                         help="Width of antiword output (only valid for 'text' format).")
     parser.add_argument("--output-format", choices=["text", "xml", "bracketed"], 
                         default="text", help="Selection of output format.")
+    parser.add_argument("--query", nargs="+", metavar="TERM",
+                        help="Inspect index search results from the local mirror.")
+    parser.add_argument("--field", action="append", metavar="KEY=VALUE",
+                        help="Metadata field filter for --query results (repeatable).")
+    parser.add_argument("--prefetch", type=int, default=2,
+                        help="Number of upcoming batches to prepare in the background.")
+    parser.add_argument("--workers", type=int, default=8,
+                        help="Number of background download/render workers.")
+    parser.add_argument("--all", action="store_true",
+                        help="Non-interactively write reports for every file.")
     args = parser.parse_args()
 
     if args.width is not None and args.output_format != "text":
         parser.error("--width can only be used with --output-format text")
+    if args.batch < 1 or args.workers < 1 or args.prefetch < 0:
+        parser.error("--batch and --workers must be positive; --prefetch non-negative")
     
     width = args.width if args.width is not None else 80
+    render_options = {
+        "save_thumbnails": args.save_thumbnails,
+        "width": width,
+        "output_format": args.output_format,
+    }
 
-    if not constants.FOLDER_ID_SOURCE_DOCS:
-        print("Error: FOLDER_ID_SOURCE_DOCS not set in .env")
-        sys.exit(1)
+    if args.query or args.field:
+        try:
+            fields = search.parse_field_filters(args.field)
+            results = search.find_documents(args.query or [], fields=fields)
+        except (ValueError, FileNotFoundError) as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+        if not results:
+            print("No matching documents found in the index.")
+            return
+        # No Drive IDs: these are opened from the local mirror only.
+        files = [{"name": source} for _, source, _ in results]
+    else:
+        if not constants.FOLDER_ID_SOURCE_DOCS:
+            print("Error: FOLDER_ID_SOURCE_DOCS not set in .env")
+            sys.exit(1)
 
-    try:
-        service = auth.get_drive_service()
-    except Exception as e:
-        print(f"Failed to initialize Drive service: {e}")
-        sys.exit(1)
+        try:
+            service = auth.get_drive_service()
+        except Exception as e:
+            print(f"Failed to initialize Drive service: {e}")
+            sys.exit(1)
 
-    # Ensure exploration directory exists
-    constants.EXPLORATION_DOCS_DIR.mkdir(parents=True, exist_ok=True)
+        print("Fetching file list (newest first)...")
+        try:
+            files = drive_client.list_files_in_folder(
+                service, constants.FOLDER_ID_SOURCE_DOCS)
+        except Exception as e:
+            print(f"Failed to fetch file list: {e}")
+            sys.exit(1)
 
-    print("Fetching file list (newest first)...")
-    try:
-        remote_files = drive_client.list_files_in_folder(
-            service, constants.FOLDER_ID_SOURCE_DOCS)
-    except Exception as e:
-        print(f"Failed to fetch file list: {e}")
-        sys.exit(1)
+        if not files:
+            print("No files found in the specified source folder.")
+            return
 
-    if not remote_files:
-        print("No files found in the specified source folder.")
-        return
+    # Ensure exploration directory exists
+    constants.EXPLORATION_DOCS_DIR.mkdir(parents=True, exist_ok=True)
 
-    processed_count = 0
-    for file_info in remote_files:
-        name = file_info["name"]
-        file_id = file_info["id"]
-        dest_path = constants.EXPLORATION_DOCS_DIR / name
-
-        if not dest_path.exists():
-            print(f"Downloading to exploration cache: {name}...")
-            try:
-                drive_client.download_file(service, file_id, dest_path)
-            except Exception as e:
-                print(f"Failed to download {name}: {e}")
-                continue
-        
-        inspect_doc(dest_path, 
-                    save_thumbnails=args.save_thumbnails, 
-                    width=width,
-                    output_format=args.output_format)
-        processed_count += 1
-
-        if processed_count >= args.batch:
-            user_input = input("\n[Enter] for next batch, [q] to quit: ").strip().lower()
-            if user_input == "q":
-                break
-            processed_count = 0
+    if args.all:
+        _run_all(files, render_options, args.workers)
+    else:
+        _run_interactive(files, render_options, args.batch, args.prefetch, args.workers)
 
 
 if __name__ == "__main__":
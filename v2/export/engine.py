@@ -0,0 +1,268 @@
+"""Stage: Export logic (Bracketed Text -> SQLite & Columnar Dataset).
+
+Every converted document is exported with its metadata header, parsed
+invoice date, category/bucket (out-of-scope documents included, with
+category 'out_of_scope') and table rows. Writes use prepared executemany
+inserts committed in batches. A document is rewritten only when its content
+hash or the categorization rules version changed since the last export.
+"""
+
+import hashlib
+import json
+import re
+import sqlite3
+
+from v2.common import constants
+from v2.scoping import engine as scoping
+
+# Number of documents written per transaction.
+BATCH_SIZE = 200
+
+# Bump whenever the exported columns or their derivation change so every
+# document is re-exported on the next run.
+EXPORT_VERSION = "v3"
+
+# Bump together with _SCHEMA; older export databases are rebuilt.
+_SCHEMA_VERSION = 2
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS invoices (
+    name TEXT PRIMARY KEY,
+    filename TEXT,
+    invoice_number TEXT,
+    invoice_number_base INTEGER,
+    invoice_date TEXT,
+    used_heuristic INTEGER NOT NULL,
+    category TEXT NOT NULL,
+    bucket TEXT NOT NULL,
+    in_working_set INTEGER NOT NULL,
+    create_time TEXT,
+    last_saved_time TEXT,
+    content_hash TEXT NOT NULL,
+    rules_version TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_invoices_number ON invoices (invoice_number);
+CREATE INDEX IF NOT EXISTS idx_invoices_number_base ON invoices (invoice_number_base);
+CREATE INDEX IF NOT EXISTS idx_invoices_date ON invoices (invoice_date);
+CREATE INDEX IF NOT EXISTS idx_invoices_bucket ON invoices (bucket);
+CREATE TABLE IF NOT EXISTS table_rows (
+    invoice_name TEXT NOT NULL,
+    table_index INTEGER NOT NULL,
+    row_index INTEGER NOT NULL,
+    cell_count INTEGER NOT NULL,
+    cells TEXT NOT NULL,
+    PRIMARY KEY (invoice_name, table_index, row_index)
+);
+"""
+
+_INVOICE_COLUMNS = [
+    "name", "filename", "invoice_number", "invoice_number_base", "invoice_date",
+    "used_heuristic", "category", "bucket", "in_working_set", "create_time",
+    "last_saved_time", "content_hash", "rules_version",
+]
+_ROW_COLUMNS = ["invoice_name", "table_index", "row_index", "cell_count", "cells"]
+
+_INSERT_INVOICE = (
+    f"INSERT OR REPLACE INTO invoices ({', '.join(_INVOICE_COLUMNS)}) "
+    f"VALUES ({', '.join('?' * len(_INVOICE_COLUMNS))})")
+_INSERT_ROW = (
+    f"INSERT INTO table_rows ({', '.join(_ROW_COLUMNS)}) "
+    f"VALUES ({', '.join('?' * len(_ROW_COLUMNS))})")
+
+
+def get_rules_version():
+    """Returns a fingerprint of the export version and the scoping cutoff."""
+    rules = f"{EXPORT_VERSION}:{constants.IN_SCOPE_START_DATE.isoformat()}"
+    return hashlib.sha256(rules.encode("utf-8")).hexdigest()[:16]
+
+
+def connect(db_path):
+    """Opens the export database, rebuilding it if the schema is outdated."""
+    conn = sqlite3.connect(db_path)
+    if conn.execute("PRAGMA user_version").fetchone()[0] != _SCHEMA_VERSION:
+        with conn:
+            conn.execute("DROP TABLE IF EXISTS invoices")
+            conn.execute("DROP TABLE IF EXISTS table_rows")
+        conn.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+def get_table_rows(lines):
+    """Yields (table_index, row_index, cells) for every bracketed table row."""
+    table_index = -1
+    row_index = 0
+    in_table = False
+    for line in lines:
+        stripped = line.strip()
+        if stripped == "--- TABLE START ---":
+            in_table = True
+            table_index += 1
+            row_index = 0
+        elif stripped == "--- TABLE END ---":
+            in_table = False
+        elif in_table and stripped:
+            yield table_index, row_index, scoping.extract_cells(stripped)
+            row_index += 1
+
+
+def build_invoice_record(txt_path, lines, content_hash, rules_version):
+    """Returns the invoice column values for a converted document."""
+    meta = scoping.get_metadata_from_text(lines)
+    category, bucket_date, inv_date, used_heuristic = scoping.categorize_document(lines)
+    bucket_name = scoping.get_bucket_name(bucket_date) if bucket_date else category
+
+    filename = meta.get("filename", f"{txt_path.stem}.doc")
+    invoice_number = filename.rsplit(".", 1)[0]
+    base_match = re.match(r"(\d+)", invoice_number)
+
+    return {
+        "name": txt_path.name,
+        "filename": filename,
+        "invoice_number": invoice_number,
+        "invoice_number_base": int(base_match.group(1)) if base_match else None,
+        "invoice_date": inv_date.isoformat() if inv_date else None,
+        "used_heuristic": int(used_heuristic),
+        "category": category,
+        "bucket": bucket_name,
+        "in_working_set": int(scoping.should_include_in_working_set(category, bucket_name)),
+        "create_time": meta.get("create_time"),
+        "last_saved_time": meta.get("last_saved_time"),
+        "content_hash": content_hash,
+        "rules_version": rules_version,
+    }
+
+
+def _flush(conn, records, rows):
+    """Writes a batch of invoices and their table rows in one transaction."""
+    with conn:
+        names = [(record["name"],) for record in records]
+        conn.executemany("DELETE FROM table_rows WHERE invoice_name = ?", names)
+        conn.executemany(
+            _INSERT_INVOICE, [[r[c] for c in _INVOICE_COLUMNS] for r in records])
+        conn.executemany(_INSERT_ROW, rows)
+
+
+def _write_parquet_table(pa, pq, conn, query, column_names, path):
+    """Writes the rows of a query to a Parquet file via a temporary file."""
+    columns = list(zip(*conn.execute(query).fetchall())) or [()] * len(column_names)
+    table = pa.table({name: list(values) for name, values in zip(column_names, columns)})
+    temp_path = path.with_suffix(".parquet.tmp")
+    pq.write_table(table, temp_path)
+    temp_path.replace(path)
+
+
+def write_parquet(conn):
+    """Writes the invoices and table_rows tables to Parquet if pyarrow is installed.
+
+    Returns:
+        True if the files were written, False if pyarrow is unavailable.
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        return False
+
+    _write_parquet_table(
+        pa, pq, conn,
+        f"SELECT {', '.join(_INVOICE_COLUMNS)} FROM invoices ORDER BY invoice_date, name",
+        _INVOICE_COLUMNS, constants.EXPORT_PARQUET_PATH)
+    _write_parquet_table(
+        pa, pq, conn,
+        f"SELECT {', '.join(_ROW_COLUMNS)} FROM table_rows "
+        "ORDER BY invoice_name, table_index, row_index",
+        _ROW_COLUMNS, constants.EXPORT_TABLE_ROWS_PARQUET_PATH)
+    return True
+
+
+def run_export():
+    """Incrementally exports converted documents to SQLite and a columnar file."""
+    print("--- [ STAGE: EXPORT ] ---")
+
+    if not constants.CONVERTED_DIR.exists():
+        print("Error: Converted directory not found.")
+        return
+
+    constants.EXPORTED_DIR.mkdir(parents=True, exist_ok=True)
+    transcribed_files = sorted(constants.CONVERTED_DIR.glob("*.txt"))
+    print(f"Found {len(transcribed_files)} converted files.")
+
+    rules_version = get_rules_version()
+    conn = connect(constants.EXPORT_DB_PATH)
+    try:
+        signatures = {
+            name: (content_hash, version)
+            for name, content_hash, version in conn.execute(
+                "SELECT name, content_hash, rules_version FROM invoices")
+        }
+
+        exported_count = 0
+        unchanged_count = 0
+        error_count = 0
+        records = []
+        rows = []
+
+        for txt_path in transcribed_files:
+            name = txt_path.name
+            try:
+                with open(txt_path, "r", encoding="utf-8") as f:
+                    text = f.read()
+                content_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+                # 1. Skip documents whose content and rules are unchanged (incremental).
+                if signatures.get(name) == (content_hash, rules_version):
+                    unchanged_count += 1
+                    continue
+
+                lines = text.splitlines()
+                record = build_invoice_record(txt_path, lines, content_hash, rules_version)
+                doc_rows = [
+                    (name, table_index, row_index, len(cells),
+                     json.dumps(cells, ensure_ascii=False))
+                    for table_index, row_index, cells in get_table_rows(lines)
+                ]
+            except Exception as e:
+                print(f"Error exporting {name}: {e}")
+                error_count += 1
+                continue
+
+            records.append(record)
+            rows.extend(doc_rows)
+
+            # 2. Commit in batches rather than per document.
+            if len(records) >= BATCH_SIZE:
+                _flush(conn, records, rows)
+                exported_count += len(records)
+                records, rows = [], []
+                print(f"Exported {exported_count} documents...")
+
+        if records:
+            _flush(conn, records, rows)
+            exported_count += len(records)
+
+        # 3. Drop documents whose converted file no longer exists.
+        current_names = {txt_path.name for txt_path in transcribed_files}
+        removed = [(name,) for name in signatures if name not in current_names]
+        with conn:
+            conn.executemany("DELETE FROM table_rows WHERE invoice_name = ?", removed)
+            conn.executemany("DELETE FROM invoices WHERE name = ?", removed)
+
+        wrote_parquet = write_parquet(conn)
+    finally:
+        conn.close()
+
+    print(f"Export Complete.")
+    print(f"Exported (New/Changed):   {exported_count}")
+    print(f"Skipped (Unchanged):      {unchanged_count}")
+    print(f"Removed (Deleted):        {len(removed)}")
+    print(f"SQLite:                   {constants.EXPORT_DB_PATH}")
+    if wrote_parquet:
+        print(f"Parquet:                  {constants.EXPORT_PARQUET_PATH}")
+        print(f"                          {constants.EXPORT_TABLE_ROWS_PARQUET_PATH}")
+    else:
+        print("Parquet:                  skipped (pyarrow not installed; "
+              "uv sync --extra export)")
+    if error_count > 0:
+        print(f"Failed:                   {error_count}")
+    print("-" * 25)
@@ -0,0 +1,204 @@
+"""Stage: Extraction logic (Bracketed Text -> Structured Invoice JSON via LLM).
+
+Documents from the fully_scoped working set are packed into requests up to a
+token budget and sent through the async scheduler. Responses are cached by
+document content hash, prompt version and model endpoint, so unchanged
+documents are never sent again on a rerun. Stub runs keep their results and
+cache under tmp/ so fake extractions never reach the pipeline output.
+"""
+
+import argparse
+import asyncio
+import functools
+import hashlib
+import json
+import os
+import time
+
+from v2.common import constants
+from v2.extraction import model_client, scheduler, stub_server
+
+# Bump whenever the instructions change so cached responses are invalidated.
+PROMPT_VERSION = "v1"
+
+EXTRACTION_INSTRUCTIONS = """\
+Each document is a legacy invoice in Bracketed Text: table rows are single
+lines, cells are wrapped in [ ], in-cell line breaks are <br>, and empty
+cells are [ EMPTY ]. For every document return one JSON object with:
+invoice_number_base (number), invoice_number_full (string, e.g. 123-A),
+date (YYYY-MM-DD), total_amount (number), line_items (array of
+{description, quantity, unit_price, line_total}), confidence_score (0.0-1.0)
+and data_conflict (boolean)."""
+
+
+# Model identity used in cache keys for stub runs (the stub's port varies).
+STUB_MODEL_ID = "stub"
+
+
+def get_cache_key(document_hash, model_id):
+    """Returns the response cache key for a document under the current prompt and model."""
+    key = f"{PROMPT_VERSION}:{model_id}:{document_hash}"
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+def _write_json_atomic(path, data):
+    """Writes JSON via a temporary file so readers never see partial output."""
+    temp_path = path.with_suffix(path.suffix + ".tmp")
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+    os.replace(temp_path, path)
+
+
+def _write_result(results_dir, doc, extraction, model_id):
+    """Writes the per-document result file for a successful extraction."""
+    result_path = results_dir / f"{doc['path'].stem}.json"
+    _write_json_atomic(result_path, {
+        "source": doc["id"],
+        "document_hash": doc["hash"],
+        "prompt_version": PROMPT_VERSION,
+        "model": model_id,
+        "extraction": extraction,
+    })
+
+
+def load_documents(model_id):
+    """Reads the working set and returns documents with content hashes."""
+    documents = []
+    for txt_path in sorted(constants.SCOPED_FULLY_SCOPED_DIR.glob("*.txt")):
+        with open(txt_path, "r", encoding="utf-8") as f:
+            text = f.read()
+        document_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        documents.append({
+            "id": txt_path.name,
+            "path": txt_path,
+            "text": text,
+            "hash": document_hash,
+            "cache_key": get_cache_key(document_hash, model_id),
+        })
+    return documents
+
+
+def run_extraction(endpoint=None, token_budget=8000, max_in_flight=4,
+                   max_retries=4, use_stub=False):
+    """Extracts structured data for the working set with caching and batching.
+
+    Args:
+        endpoint: Extraction endpoint URL (default: constants.EXTRACTION_ENDPOINT).
+            Required unless use_stub is set.
+        token_budget: Maximum estimated input tokens per request.
+        max_in_flight: Maximum number of concurrent requests.
+        max_retries: Retries per request on rate limits and transient errors.
+        use_stub: If True, start a local stub model server and use it instead,
+            writing results and cache under constants.EXTRACTION_STUB_DIR.
+    """
+    print("--- [ STAGE: EXTRACTION ] ---")
+
+    endpoint = endpoint or constants.EXTRACTION_ENDPOINT
+    if not endpoint and not use_stub:
+        print("Error: No extraction endpoint configured. "
+              "Set EXTRACTION_ENDPOINT, pass --endpoint, or use --stub.")
+        return
+
+    if not constants.SCOPED_FULLY_SCOPED_DIR.exists():
+        print("Error: Fully scoped directory not found.")
+        return
+
+    if use_stub:
+        model_id = STUB_MODEL_ID
+        results_dir = constants.EXTRACTION_STUB_RESULTS_DIR
+        cache_dir = constants.EXTRACTION_STUB_CACHE_DIR
+    else:
+        model_id = endpoint
+        results_dir = constants.EXTRACTED_RESULTS_DIR
+        cache_dir = constants.EXTRACTION_CACHE_DIR
+    results_dir.mkdir(parents=True, exist_ok=True)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+
+    documents = load_documents(model_id)
+    print(f"Found {len(documents)} documents in the working set.")
+
+    # 1. Serve unchanged documents from the response cache.
+    to_send = []
+    cache_hit_count = 0
+    for doc in documents:
+        cache_path = cache_dir / f"{doc['cache_key']}.json"
+        if cache_path.exists():
+            with open(cache_path, "r", encoding="utf-8") as f:
+                _write_result(results_dir, doc, json.load(f), model_id)
+            cache_hit_count += 1
+        else:
+            to_send.append(doc)
+
+    batches = scheduler.pack_documents(to_send, token_budget)
+    print(f"Cache hits: {cache_hit_count}. "
+          f"Sending {len(to_send)} documents in {len(batches)} requests...")
+
+    counts = {"extracted": 0, "failed": 0}
+
+    def _on_result(batch, success, response):
+        """Caches and writes each document's extraction as its batch completes."""
+        if not success:
+            print(f"FAILED: batch of {len(batch)} documents (Error: {response})")
+            counts["failed"] += len(batch)
+            return
+        for doc in batch:
+            extraction = response.get(doc["id"])
+            if extraction is None:
+                print(f"FAILED: {doc['id']} (Error: missing from response)")
+                counts["failed"] += 1
+                continue
+            _write_json_atomic(cache_dir / f"{doc['cache_key']}.json", extraction)
+            _write_result(results_dir, doc, extraction, model_id)
+            counts["extracted"] += 1
+
+    server = None
+    if use_stub:
+        server, endpoint, _ = stub_server.start_stub_server()
+        print(f"Using local stub model at {endpoint}")
+    send = functools.partial(
+        model_client.extract_batch,
+        endpoint,
+        prompt_version=PROMPT_VERSION,
+        instructions=EXTRACTION_INSTRUCTIONS)
+
+    start = time.perf_counter()
+    try:
+        stats = asyncio.run(scheduler.run_batches(
+            batches, send, _on_result,
+            max_in_flight=max_in_flight, max_retries=max_retries))
+    finally:
+        if server:
+            server.shutdown()
+    elapsed = time.perf_counter() - start
+
+    hit_rate = (cache_hit_count / len(documents) * 100) if documents else 0.0
+    throughput = counts["extracted"] / elapsed if elapsed > 0 else 0.0
+    print(f"Extraction Complete.")
+    print(f"Newly Extracted:          {counts['extracted']} ({throughput:.1f} docs/s)")
+    print(f"Served from Cache:        {cache_hit_count} ({hit_rate:.1f}% hit rate)")
+    print(f"Requests Sent:            {stats['requests']} ({stats['retries']} retries)")
+    if counts["failed"] > 0:
+        print(f"Failed:                   {counts['failed']}")
+    print("-" * 25)
+
+
+def main():
+    """Command line entry point for the extraction stage."""
+    parser = argparse.ArgumentParser(description="Extract invoice data from the working set.")
+    parser.add_argument("--endpoint", default=None,
+                        help="Extraction endpoint URL (default: EXTRACTION_ENDPOINT).")
+    parser.add_argument("--token-budget", type=int, default=8000,
+                        help="Maximum estimated input tokens per request.")
+    parser.add_argument("--max-in-flight", type=int, default=4,
+                        help="Maximum number of concurrent requests.")
+    parser.add_argument("--max-retries", type=int, default=4,
+                        help="Retries per request on rate limits and transient errors.")
+    parser.add_argument("--stub", action="store_true",
+                        help="Run against an in-process stub model server (offline).")
+    args = parser.parse_args()
+
+    run_extraction(endpoint=args.endpoint,
+                   token_budget=args.token_budget,
+                   max_in_flight=args.max_in_flight,
+                   max_retries=args.max_retries,
+                   use_stub=args.stub)
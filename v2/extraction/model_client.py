@@ -0,0 +1,62 @@
+"""HTTP client for the batch extraction endpoint.
+
+Protocol (JSON over POST):
+    Request:  {"prompt_version": str, "instructions": str,
+               "documents": [{"id": str, "text": str}, ...]}
+    Response: {"results": [{"id": str, "extraction": {...}}, ...]}
+"""
+
+import asyncio
+import json
+import urllib.error
+import urllib.request
+
+from v2.extraction.scheduler import TransientRequestError
+
+# HTTP statuses that indicate a retryable condition.
+_TRANSIENT_STATUSES = {408, 429, 500, 502, 503, 504}
+
+
+def post_json(endpoint, payload, timeout=120):
+    """Performs a blocking JSON POST and returns the decoded response.
+
+    Raises:
+        TransientRequestError: For rate limits, server errors and network failures.
+        ConnectionRefusedError: If nothing is listening at the endpoint; retrying
+            a misconfigured endpoint would only delay the failure.
+    """
+    request = urllib.request.Request(
+        endpoint,
+        data=json.dumps(payload).encode("utf-8"),
+        headers={"Content-Type": "application/json"},
+        method="POST")
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            return json.loads(response.read().decode("utf-8"))
+    except urllib.error.HTTPError as e:
+        if e.code in _TRANSIENT_STATUSES:
+            raise TransientRequestError(f"HTTP {e.code}") from e
+        raise
+    except ConnectionRefusedError:
+        raise
+    except urllib.error.URLError as e:
+        if isinstance(e.reason, ConnectionRefusedError):
+            raise e.reason from e
+        raise TransientRequestError(str(e)) from e
+    except (TimeoutError, ConnectionError) as e:
+        raise TransientRequestError(str(e)) from e
+
+
+async def extract_batch(endpoint, batch, prompt_version, instructions, timeout=120):
+    """Sends a packed batch and returns {document_id: extraction}.
+
+    The blocking request runs in a worker thread so many batches can be in
+    flight at once.
+    """
+    payload = {
+        "prompt_version": prompt_version,
+        "instructions": instructions,
+        "documents": [{"id": doc["id"], "text": doc["text"]} for doc in batch],
+    }
+    response = await asyncio.to_thread(post_json, endpoint, payload, timeout)
+    return {r["id"]: r["extraction"] for r in response.get("results", [])}
@@ -0,0 +1,91 @@
+"""Async request scheduler: token-budget packing, bounded concurrency, retries."""
+
+import asyncio
+import random
+
+# Rough characters-per-token ratio for budgeting; exact counts are not needed.
+CHARS_PER_TOKEN = 4
+
+
+class TransientRequestError(Exception):
+    """Raised by a send function for failures worth retrying (429, 5xx, network)."""
+
+
+def estimate_tokens(text):
+    """Returns an approximate token count for a piece of text."""
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def pack_documents(documents, token_budget):
+    """Groups documents into requests that stay within a token budget.
+
+    Documents are packed greedily in order; a document larger than the budget
+    is sent alone rather than being split.
+
+    Args:
+        documents: List of dictionaries with at least a "text" key.
+        token_budget: Maximum estimated input tokens per request.
+    Returns:
+        List of batches, each a list of documents.
+    """
+    batches = []
+    current = []
+    current_tokens = 0
+    for doc in documents:
+        tokens = estimate_tokens(doc["text"])
+        if current and current_tokens + tokens > token_budget:
+            batches.append(current)
+            current = []
+            current_tokens = 0
+        current.append(doc)
+        current_tokens += tokens
+    if current:
+        batches.append(current)
+    return batches
+
+
+async def _send_with_retry(send, batch, semaphore, stats, max_retries, base_delay):
+    """Sends one batch under the concurrency cap, retrying transient failures."""
+    for attempt in range(max_retries + 1):
+        async with semaphore:
+            stats["requests"] += 1
+            try:
+                return True, await send(batch)
+            except TransientRequestError as e:
+                error = e
+            except Exception as e:
+                return False, e
+
+        if attempt < max_retries:
+            # Exponential backoff with jitter, outside the semaphore so the
+            # slot is free for other batches while this one waits.
+            stats["retries"] += 1
+            await asyncio.sleep(base_delay * (2 ** attempt) * (0.5 + random.random()))
+    return False, error
+
+
+async def run_batches(batches, send, on_result, max_in_flight=4, max_retries=4,
+                      base_delay=1.0):
+    """Sends all batches concurrently with at most max_in_flight outstanding.
+
+    Args:
+        batches: List of batches from pack_documents.
+        send: Async function taking a batch and returning its response.
+        on_result: Callback (batch, success, response_or_error) invoked as
+            each batch completes.
+        max_in_flight: Maximum number of concurrent requests.
+        max_retries: Retries per batch for TransientRequestError.
+        base_delay: Initial backoff delay in seconds.
+    Returns:
+        Dictionary of request statistics (requests, retries).
+    """
+    semaphore = asyncio.Semaphore(max_in_flight)
+    stats = {"requests": 0, "retries": 0}
+
+    async def _run(batch):
+        success, result = await _send_with_retry(
+            send, batch, semaphore, stats, max_retries, base_delay)
+        on_result(batch, success, result)
+
+    await asyncio.gather(*(_run(batch) for batch in batches))
+    return stats
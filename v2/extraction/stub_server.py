@@ -0,0 +1,108 @@
+"""Local stub model server for offline extraction runs.
+
+Implements the batch extraction protocol from model_client with a naive
+rule-based "model" (invoice number from the filename header, date via the
+scoping heuristics), plus configurable latency and failure injection so the
+scheduler's throughput, retries and cache behaviour can be exercised offline.
+"""
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from v2.scoping import engine as scoping
+
+
+def fake_extraction(text):
+    """Returns a schema-shaped extraction derived from simple text rules."""
+    lines = text.splitlines()
+    meta = scoping.get_metadata_from_text(lines)
+    match = re.match(r"(\d+)", meta.get("filename", ""))
+    inv_date, _ = scoping.get_invoice_date_info(lines)
+    return {
+        "invoice_number_base": int(match.group(1)) if match else None,
+        "invoice_number_full": meta.get("filename", "").rsplit(".", 1)[0] or None,
+        "date": inv_date.isoformat() if inv_date else None,
+        "total_amount": None,
+        "line_items": [],
+        "confidence_score": 0.0,
+        "data_conflict": False,
+    }
+
+
+def make_handler(latency, failure_rate, stats):
+    """Builds a request handler class bound to the stub's settings."""
+
+    class StubHandler(BaseHTTPRequestHandler):
+        """Handles POST /extract with the batch extraction protocol."""
+
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            with stats["lock"]:
+                stats["requests"] += 1
+
+            if random.random() < failure_rate:
+                self.send_response(429)
+                self.end_headers()
+                return
+
+            payload = json.loads(body)
+            time.sleep(latency)
+            results = [
+                {"id": doc["id"], "extraction": fake_extraction(doc["text"])}
+                for doc in payload.get("documents", [])
+            ]
+            with stats["lock"]:
+                stats["documents"] += len(results)
+
+            data = json.dumps({"results": results}).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            """Silences per-request logging."""
+
+    return StubHandler
+
+
+def start_stub_server(host="127.0.0.1", port=0, latency=0.2, failure_rate=0.0):
+    """Starts the stub server on a background thread.
+
+    Returns:
+        Tuple of (server, endpoint_url, stats). Call server.shutdown() to stop.
+    """
+    stats = {"requests": 0, "documents": 0, "lock": threading.Lock()}
+    server = ThreadingHTTPServer(
+        (host, port), make_handler(latency, failure_rate, stats))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    endpoint = f"http://{host}:{server.server_address[1]}/extract"
+    return server, endpoint, stats
+
+
+def main():
+    """Command line entry point to run the stub server in the foreground."""
+    parser = argparse.ArgumentParser(description="Run a local stub extraction model.")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.2,
+                        help="Seconds of simulated latency per request.")
+    parser.add_argument("--failure-rate", type=float, default=0.0,
+                        help="Fraction of requests answered with HTTP 429.")
+    args = parser.parse_args()
+
+    server, endpoint, stats = start_stub_server(
+        port=args.port, latency=args.latency, failure_rate=args.failure_rate)
+    print(f"Stub model listening on {endpoint} (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.shutdown()
+        print(f"\nServed {stats['requests']} requests, {stats['documents']} documents.")
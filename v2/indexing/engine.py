@@ -0,0 +1,86 @@
+"""Stage: Indexing logic (Bracketed Text -> Inverted Full-Text & Field Index)."""
+
+from v2.common import constants
+from v2.indexing import index_store
+from v2.scoping import engine as scoping
+
+
+def run_indexing():
+    """Incrementally indexes all converted text files into the on-disk index."""
+    print("--- [ STAGE: INDEXING ] ---")
+
+    if not constants.CONVERTED_DIR.exists():
+        print("Error: Converted directory not found.")
+        return
+
+    transcribed_files = list(constants.CONVERTED_DIR.glob("*.txt"))
+    print(f"Found {len(transcribed_files)} converted files.")
+
+    conn = index_store.connect(constants.INDEX_DB_PATH)
+    signatures = index_store.get_signatures(conn)
+
+    indexed_count = 0
+    updated_count = 0
+    unchanged_count = 0
+    error_count = 0
+
+    try:
+        # A single transaction keeps the whole update atomic and fast. It is
+        # opened explicitly so the per-file savepoints nest inside it instead
+        # of each starting (and on release, committing) a transaction of its own.
+        with conn:
+            conn.execute("BEGIN")
+            for txt_path in transcribed_files:
+                stat = txt_path.stat()
+                existing = signatures.pop(txt_path.name, None)
+
+                # 1. Skip files whose signature has not changed (incremental).
+                if existing and existing[1:] == (stat.st_mtime_ns, stat.st_size):
+                    unchanged_count += 1
+                    continue
+
+                # Per-file savepoint so a failure never commits a partial document.
+                conn.execute("SAVEPOINT index_file")
+                try:
+                    with open(txt_path, "r", encoding="utf-8") as f:
+                        lines = f.read().splitlines()
+                    meta = scoping.get_metadata_from_text(lines)
+                    source_name = meta.get("filename", f"{txt_path.stem}.doc")
+
+                    # 2. Replace stale postings for changed files.
+                    if existing:
+                        index_store.remove_document(conn, existing[0])
+
+                    index_store.add_document(
+                        conn, txt_path.name, source_name,
+                        stat.st_mtime_ns, stat.st_size, lines, meta)
+                    conn.execute("RELEASE SAVEPOINT index_file")
+
+                except Exception as e:
+                    conn.execute("ROLLBACK TO SAVEPOINT index_file")
+                    conn.execute("RELEASE SAVEPOINT index_file")
+                    print(f"Error indexing {txt_path.name}: {e}")
+                    error_count += 1
+                    continue
+
+                if existing:
+                    updated_count += 1
+                else:
+                    indexed_count += 1
+                if (indexed_count + updated_count) % 100 == 0:
+                    print(f"Indexed {indexed_count + updated_count} files...")
+
+            # 3. Drop documents whose converted file no longer exists.
+            for doc_id, _, _ in signatures.values():
+                index_store.remove_document(conn, doc_id)
+    finally:
+        conn.close()
+
+    print(f"Indexing Complete.")
+    print(f"Newly Indexed:            {indexed_count}")
+    print(f"Re-indexed (Changed):     {updated_count}")
+    print(f"Skipped (Unchanged):      {unchanged_count}")
+    print(f"Removed (Deleted):        {len(signatures)}")
+    if error_count > 0:
+        print(f"Failed:                   {error_count}")
+    print("-" * 25)
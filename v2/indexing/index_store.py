@@ -0,0 +1,188 @@
+"""On-disk inverted index over bracketed text, backed by SQLite.
+
+The index holds three tables:
+  - documents: One row per indexed .txt file with its mtime/size signature,
+    used to detect changed files for incremental updates.
+  - postings: (token, doc_id, line_no) triples for every token on every line,
+    so a query term can be resolved to the exact line it appears on.
+  - fields: (doc_id, key, value) rows for the metadata header fields.
+"""
+
+import re
+import sqlite3
+
+_TOKEN_RE = re.compile(r"[^\W_]+")
+
+# Structural lines emitted by doc_parser that carry no searchable content.
+_STRUCTURAL_LINES = {
+    "--- METADATA START ---",
+    "--- METADATA END ---",
+    "--- TABLE START ---",
+    "--- TABLE END ---",
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY,
+    name TEXT UNIQUE NOT NULL,
+    source_name TEXT NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS postings (
+    token TEXT NOT NULL,
+    doc_id INTEGER NOT NULL,
+    line_no INTEGER NOT NULL,
+    PRIMARY KEY (token, doc_id, line_no)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_postings_doc ON postings (doc_id);
+CREATE TABLE IF NOT EXISTS fields (
+    doc_id INTEGER NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_fields_key ON fields (key, value);
+CREATE INDEX IF NOT EXISTS idx_fields_doc ON fields (doc_id);
+"""
+
+
+def tokenize(text):
+    """Splits bracketed text into lowercase search tokens.
+
+    Cell brackets, `<br>` markers and `[ EMPTY ]` placeholders are dropped so
+    that only the actual cell and paragraph content is indexed.
+    """
+    text = text.replace("[ EMPTY ]", " ").replace("<br>", " ")
+    return _TOKEN_RE.findall(text.lower())
+
+
+def tokenize_lines(lines):
+    """Yields (line_no, token) pairs for all searchable lines of a document."""
+    for line_no, line in enumerate(lines):
+        if line.strip() in _STRUCTURAL_LINES:
+            continue
+        for token in set(tokenize(line)):
+            yield line_no, token
+
+
+def connect(db_path):
+    """Opens (and initializes if needed) the index database at db_path."""
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(db_path)
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+def get_signatures(conn):
+    """Returns {name: (doc_id, mtime_ns, size)} for all indexed documents."""
+    rows = conn.execute("SELECT name, id, mtime_ns, size FROM documents")
+    return {name: (doc_id, mtime_ns, size) for name, doc_id, mtime_ns, size in rows}
+
+
+def remove_document(conn, doc_id):
+    """Deletes a document and all of its postings and fields."""
+    conn.execute("DELETE FROM postings WHERE doc_id = ?", (doc_id,))
+    conn.execute("DELETE FROM fields WHERE doc_id = ?", (doc_id,))
+    conn.execute("DELETE FROM documents WHERE id = ?", (doc_id,))
+
+
+def add_document(conn, name, source_name, mtime_ns, size, lines, metadata):
+    """Indexes a single document's lines and metadata header fields.
+
+    Args:
+        conn: Open index connection (caller manages the transaction).
+        name: The converted .txt file name.
+        source_name: The original .doc file name in the discovered mirror.
+        mtime_ns: Modification time of the .txt file, in nanoseconds.
+        size: Size of the .txt file in bytes.
+        lines: The document's lines.
+        metadata: Dictionary of metadata header fields.
+    """
+    cursor = conn.execute(
+        "INSERT INTO documents (name, source_name, mtime_ns, size) "
+        "VALUES (?, ?, ?, ?)",
+        (name, source_name, mtime_ns, size))
+    doc_id = cursor.lastrowid
+    conn.executemany(
+        "INSERT OR IGNORE INTO postings (token, doc_id, line_no) VALUES (?, ?, ?)",
+        ((token, doc_id, line_no) for line_no, token in tokenize_lines(lines)))
+    conn.executemany(
+        "INSERT INTO fields (doc_id, key, value) VALUES (?, ?, ?)",
+        ((doc_id, key, value) for key, value in metadata.items()))
+
+
+def _match_term(conn, term):
+    """Returns {doc_id: line_no} for documents with a line containing all term tokens."""
+    tokens = sorted(set(tokenize(term)))
+    if not tokens:
+        return {}
+
+    # Self-join the postings once per extra token, pinned to the same line.
+    joins = [
+        f"JOIN postings p{i} ON p{i}.doc_id = p0.doc_id "
+        f"AND p{i}.line_no = p0.line_no AND p{i}.token = ?"
+        for i in range(1, len(tokens))
+    ]
+    sql = (
+        "SELECT p0.doc_id, MIN(p0.line_no) FROM postings p0 "
+        + " ".join(joins)
+        + " WHERE p0.token = ? GROUP BY p0.doc_id")
+    return dict(conn.execute(sql, [*tokens[1:], tokens[0]]).fetchall())
+
+
+def _match_field(conn, key, value):
+    """Returns the set of doc_ids whose metadata field contains value."""
+    # Escape LIKE wildcards so value is matched literally.
+    escaped = value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    rows = conn.execute(
+        "SELECT doc_id FROM fields WHERE key = ? AND value LIKE ? ESCAPE '\\'",
+        (key, f"%{escaped}%"))
+    return {doc_id for (doc_id,) in rows}
+
+
+def search(conn, terms, fields=None, match_any=False, limit=50):
+    """Finds documents matching the query terms and field filters.
+
+    Each term matches a document when a single line contains all of the
+    term's tokens, so a part number like "AB-123" must appear together.
+
+    Args:
+        conn: Open index connection.
+        terms: List of free-text query terms.
+        fields: Optional dictionary of {key: value} metadata substring filters.
+        match_any: If True, documents need only match one term (OR);
+            otherwise all terms must match (AND).
+        limit: Maximum number of results to return.
+    Returns:
+        List of (name, source_name, line_no) tuples ordered by name, where
+        line_no is the first matching line or None for field-only matches.
+    """
+    hits = None
+    for term in terms:
+        matches = _match_term(conn, term)
+        if hits is None:
+            hits = matches
+        elif match_any:
+            for doc_id, line_no in matches.items():
+                hits.setdefault(doc_id, line_no)
+        else:
+            hits = {d: l for d, l in hits.items() if d in matches}
+
+    for key, value in (fields or {}).items():
+        doc_ids = _match_field(conn, key, value)
+        if hits is None:
+            hits = {doc_id: None for doc_id in doc_ids}
+        else:
+            hits = {d: l for d, l in hits.items() if d in doc_ids}
+
+    if not hits:
+        return []
+
+    results = []
+    rows = conn.execute("SELECT id, name, source_name FROM documents ORDER BY name")
+    for doc_id, name, source_name in rows:
+        if doc_id in hits:
+            results.append((name, source_name, hits[doc_id]))
+            if len(results) >= limit:
+                break
+    return results
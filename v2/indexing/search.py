@@ -0,0 +1,97 @@
+"""Index Search: Instant lookup over the converted corpus.
+
+Queries the inverted index built by the indexing stage and prints matching
+files with a snippet of the first matching line.
+"""
+
+import argparse
+import sys
+import time
+
+from v2.common import constants
+from v2.indexing import index_store
+
+SNIPPET_WIDTH = 160
+
+
+def get_snippet(name, line_no):
+    """Returns the matching line of a converted file, trimmed for display."""
+    if line_no is None:
+        return ""
+    try:
+        with open(constants.CONVERTED_DIR / name, "r", encoding="utf-8") as f:
+            lines = f.read().splitlines()
+        snippet = " ".join(lines[line_no].split())
+    except (OSError, IndexError):
+        return ""
+    if len(snippet) > SNIPPET_WIDTH:
+        snippet = snippet[:SNIPPET_WIDTH - 3] + "..."
+    return snippet
+
+
+def parse_field_filters(field_args):
+    """Converts a list of 'key=value' strings into a filter dictionary."""
+    fields = {}
+    for item in field_args or []:
+        if "=" not in item:
+            raise ValueError(f"Invalid field filter '{item}' (expected key=value)")
+        key, value = item.split("=", 1)
+        fields[key.strip()] = value.strip()
+    return fields
+
+
+def find_documents(terms, fields=None, match_any=False, limit=50):
+    """Runs a query against the on-disk index.
+
+    Returns:
+        List of (name, source_name, line_no) tuples; see index_store.search.
+    """
+    if not constants.INDEX_DB_PATH.exists():
+        raise FileNotFoundError(
+            f"Index not found at {constants.INDEX_DB_PATH}. Run the indexing stage first.")
+    conn = index_store.connect(constants.INDEX_DB_PATH)
+    try:
+        return index_store.search(
+            conn, terms, fields=fields, match_any=match_any, limit=limit)
+    finally:
+        conn.close()
+
+
+def main():
+    """Command line entry point for querying the index."""
+    parser = argparse.ArgumentParser(description="Search the converted invoice corpus.")
+    parser.add_argument("terms", nargs="*",
+                        help="Query terms; each term must appear on a single line.")
+    parser.add_argument("--field", action="append", metavar="KEY=VALUE",
+                        help="Filter on a metadata header field (repeatable).")
+    parser.add_argument("--any", action="store_true",
+                        help="Match documents containing any term instead of all.")
+    parser.add_argument("--limit", type=int, default=50,
+                        help="Maximum number of results to show.")
+    args = parser.parse_args()
+
+    try:
+        fields = parse_field_filters(args.field)
+    except ValueError as e:
+        parser.error(str(e))
+
+    if not args.terms and not fields:
+        parser.error("Provide at least one query term or --field filter.")
+
+    start = time.perf_counter()
+    try:
+        results = find_documents(
+            args.terms, fields=fields, match_any=args.any, limit=args.limit)
+    except FileNotFoundError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    for name, source_name, line_no in results:
+        location = f"{name}:{line_no + 1}" if line_no is not None else name
+        print(f"{location}  ({source_name})")
+        snippet = get_snippet(name, line_no)
+        if snippet:
+            print(f"    {snippet}")
+
+    print(f"\n{len(results)} match(es) in {elapsed_ms:.1f} ms.")
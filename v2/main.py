@@ -9,7 +9,11 @@ import argparse
 import sys
 from v2.discovery import engine as discovery
 from v2.conversion import engine as conversion
+from v2.indexing import engine as indexing
 from v2.scoping import engine as scoping
+from v2.thumbnails import engine as thumbnails
+from v2.extraction import engine as extraction
+from v2.export import engine as export
 
 def main():
     """Main entry point for the V2 pipeline orchestrator."""
@@ -19,9 +23,17 @@ def main():
     parser.add_argument(
         "--stages", 
         nargs="+", 
-        choices=["discovery", "conversion", "scoping"],
-        default=["discovery", "conversion", "scoping"],
-        help="Specific stages to run (default: all)"
+        choices=["discovery", "conversion", "indexing", "scoping", "thumbnails",
+                 "extraction", "export"],
+        default=["discovery", "conversion", "indexing", "scoping", "thumbnails",
+                 "export"],
+        help="Specific stages to run (default: all except extraction)"
+    )
+    parser.add_argument(
+        "--conversion-backend",
+        choices=conversion.BACKENDS,
+        default="antiword",
+        help="Word extraction backend for the conversion stage (default: antiword)"
     )
     args = parser.parse_args()
 
@@ -40,11 +52,19 @@ def main():
     # Run Conversion Stage
     if "conversion" in args.stages:
         try:
-            conversion.run_conversion()
+            conversion.run_conversion(backend=args.conversion_backend)
         except Exception as e:
             print(f"CRITICAL: Conversion stage failed: {e}")
             sys.exit(1)
 
+    # Run Indexing Stage
+    if "indexing" in args.stages:
+        try:
+            indexing.run_indexing()
+        except Exception as e:
+            print(f"CRITICAL: Indexing stage failed: {e}")
+            sys.exit(1)
+
     # Run Scoping Stage
     if "scoping" in args.stages:
         try:
@@ -53,6 +73,30 @@ def main():
             print(f"CRITICAL: Scoping stage failed: {e}")
             sys.exit(1)
 
+    # Run Thumbnails Stage (fully_scoped working set)
+    if "thumbnails" in args.stages:
+        try:
+            thumbnails.run_thumbnails()
+        except Exception as e:
+            print(f"CRITICAL: Thumbnails stage failed: {e}")
+            sys.exit(1)
+
+    # Run Extraction Stage (opt-in: requires a model endpoint)
+    if "extraction" in args.stages:
+        try:
+            extraction.run_extraction()
+        except Exception as e:
+            print(f"CRITICAL: Extraction stage failed: {e}")
+            sys.exit(1)
+
+    # Run Export Stage
+    if "export" in args.stages:
+        try:
+            export.run_export()
+        except Exception as e:
+            print(f"CRITICAL: Export stage failed: {e}")
+            sys.exit(1)
+
     print("\n" + "=" * 60)
     print("          PIPELINE EXECUTION FINISHED")
     print("=" * 60 + "\n")
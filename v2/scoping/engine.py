@@ -5,6 +5,14 @@ import shutil
 from datetime import datetime, date
 from v2.common import constants
 
+# Forensic status directory for each in-scope category.
+STATUS_DIRS = {
+    "failed": constants.SCOPED_STATUS_FAILED_DIR,
+    "successful": constants.SCOPED_STATUS_SUCCESSFUL_DIR,
+    "heuristic": constants.SCOPED_STATUS_HEURISTIC_DIR,
+    "conflict": constants.SCOPED_STATUS_CONFLICT_DIR,
+}
+
 def parse_date_with_heuristics(date_str):
     """Parses date and returns (date_object, used_heuristic)."""
     used_heuristic = False
@@ -100,6 +108,48 @@ def should_include_in_working_set(category, bucket_name):
     # For others, only include if they are in the post-cutoff windows
     return bucket_name in ["3_slightly_after_cutoff", "4_recent"]
 
+def categorize_document(lines):
+    """Applies the mutually exclusive categorization rules to a transcribed file.
+
+    Returns:
+        Tuple of (category, bucket_date, invoice_date, used_heuristic), where
+        bucket_date is None for out-of-scope documents.
+    """
+    meta = get_metadata_from_text(lines)
+    inv_date, used_heuristic = get_invoice_date_info(lines)
+
+    # 1. Determine Metadata Date for Failure Bucketing
+    meta_dates = []
+    for key in ["create_time", "last_saved_time"]:
+        if key in meta:
+            try:
+                dt = datetime.fromisoformat(meta[key]).date()
+                meta_dates.append(dt)
+            except ValueError:
+                continue
+    latest_meta_date = max(meta_dates) if meta_dates else date(1900, 1, 1)
+
+    # CATEGORIZATION LOGIC (Mutually Exclusive)
+
+    # Category: Failed
+    if inv_date is None:
+        return "failed", latest_meta_date, inv_date, used_heuristic
+
+    # Category: Successful (Clean In-Scope)
+    if inv_date >= constants.IN_SCOPE_START_DATE and not used_heuristic:
+        return "successful", inv_date, inv_date, used_heuristic
+
+    # Category: Heuristic (Messy In-Scope)
+    if inv_date >= constants.IN_SCOPE_START_DATE and used_heuristic:
+        return "heuristic", inv_date, inv_date, used_heuristic
+
+    # Category: Conflict (Old Invoice Date, Recent Metadata)
+    if latest_meta_date >= constants.IN_SCOPE_START_DATE:
+        return "conflict", inv_date, inv_date, used_heuristic
+
+    # Category: Out of Scope
+    return "out_of_scope", None, inv_date, used_heuristic
+
 def run_scoping():
     """Filters converted files and buckets results into forensic and production branches."""
     print("--- [ STAGE: SCOPING ] ---")
@@ -125,55 +175,15 @@ def run_scoping():
         with open(txt_path, "r", encoding="utf-8") as f:
             lines = f.readlines()
         
-        meta = get_metadata_from_text(lines)
-        inv_date, used_heuristic = get_invoice_date_info(lines)
-        
-        # 1. Determine Metadata Date for Failure Bucketing
-        meta_dates = []
-        for key in ["create_time", "last_saved_time"]:
-            if key in meta:
-                try:
-                    dt = datetime.fromisoformat(meta[key]).date()
-                    meta_dates.append(dt)
-                except ValueError:
-                    continue
-        latest_meta_date = max(meta_dates) if meta_dates else date(1900, 1, 1)
-        
-        category = None
-        bucket_date = None
-        
-        # CATEGORIZATION LOGIC (Mutually Exclusive)
-        
-        # Category: Failed
-        if inv_date is None:
-            category = "failed"
-            bucket_date = latest_meta_date
-            dest_status_root = constants.SCOPED_STATUS_FAILED_DIR
-            
-        # Category: Successful (Clean In-Scope)
-        elif inv_date >= constants.IN_SCOPE_START_DATE and not used_heuristic:
-            category = "successful"
-            bucket_date = inv_date
-            dest_status_root = constants.SCOPED_STATUS_SUCCESSFUL_DIR
-            
-        # Category: Heuristic (Messy In-Scope)
-        elif inv_date >= constants.IN_SCOPE_START_DATE and used_heuristic:
-            category = "heuristic"
-            bucket_date = inv_date
-            dest_status_root = constants.SCOPED_STATUS_HEURISTIC_DIR
-            
-        # Category: Conflict (Old Invoice Date, Recent Metadata)
-        elif latest_meta_date >= constants.IN_SCOPE_START_DATE:
-            category = "conflict"
-            bucket_date = inv_date
-            dest_status_root = constants.SCOPED_STATUS_CONFLICT_DIR
-            
+        category, bucket_date, _, _ = categorize_document(lines)
+
         # Category: Out of Scope
-        else:
-            category = "out_of_scope"
+        if category == "out_of_scope":
             counts["out_of_scope"] += 1
             continue
 
+        dest_status_root = STATUS_DIRS[category]
+
         # FILING LOGIC
         bucket_name = get_bucket_name(bucket_date)
         
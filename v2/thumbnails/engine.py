@@ -0,0 +1,243 @@
+"""Stage: Thumbnail logic (.doc OLE2 Thumbnail -> Cached JPG & Contact Sheet).
+
+Thumbnails are pulled from the OLE2 metadata in parallel worker processes and
+stored under the SHA-256 of their WMF bytes, so identical or unchanged
+thumbnails are rendered by wmf2gd only once. A manifest remembers each
+document's signature and thumbnail hash so unchanged documents are not even
+re-opened on later runs.
+"""
+
+import argparse
+import concurrent.futures
+import hashlib
+import html
+import json
+import os
+import subprocess
+import threading
+from pathlib import Path
+
+from v2.common import constants
+from v2.conversion import doc_parser
+from v2.scoping import engine as scoping
+
+
+def store_thumbnail(thumbnail):
+    """Stores unwrapped WMF bytes in the cache and returns their SHA-256 digest."""
+    constants.THUMBNAILS_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    digest = hashlib.sha256(thumbnail).hexdigest()
+    wmf_path = constants.THUMBNAILS_CACHE_DIR / f"{digest}.wmf"
+    if not wmf_path.exists():
+        # Unique temp name per worker (process and thread), since the inspector
+        # stores thumbnails concurrently; atomic rename ensures integrity.
+        temp_path = wmf_path.with_suffix(
+            f".{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(temp_path, "wb") as f:
+            f.write(thumbnail)
+        os.replace(temp_path, wmf_path)
+    return digest
+
+
+def _extract_task(doc_path):
+    """Worker function to extract and cache a single document's thumbnail.
+
+    Returns:
+        Tuple of (name, thumbnail_hash or None, error message or None).
+    """
+    try:
+        thumbnail = doc_parser.get_ole_thumbnail(doc_path)
+        if not thumbnail:
+            return doc_path.name, None, None
+        return doc_path.name, store_thumbnail(thumbnail), None
+    except Exception as e:
+        return doc_path.name, None, str(e)
+
+
+def render_thumbnail(digest):
+    """Renders a cached WMF thumbnail to JPG via wmf2gd.
+
+    Returns:
+        Tuple of (success, digest or error message).
+    """
+    wmf_path = constants.THUMBNAILS_CACHE_DIR / f"{digest}.wmf"
+    jpg_path = constants.THUMBNAILS_CACHE_DIR / f"{digest}.jpg"
+    # Unique temp name per worker (process and thread), since the inspector
+    # may render concurrently.
+    temp_path = constants.THUMBNAILS_CACHE_DIR / (
+        f"{digest}.{os.getpid()}.{threading.get_ident()}.tmp.jpg")
+    try:
+        subprocess.run(
+            ["wmf2gd", "-t", "jpeg", "-o", str(temp_path), str(wmf_path)],
+            capture_output=True,
+            check=True
+        )
+        os.replace(temp_path, jpg_path)
+        return True, digest
+    except FileNotFoundError:
+        return False, f"{digest} (Error: wmf2gd is not installed or not in PATH)"
+    except Exception as e:
+        if temp_path.exists():
+            os.remove(temp_path)
+        return False, f"{digest} (Error: {e})"
+
+
+def get_in_scope_doc_paths():
+    """Returns the discovered .doc paths for the fully_scoped working set."""
+    doc_paths = []
+    for txt_path in sorted(constants.SCOPED_FULLY_SCOPED_DIR.glob("*.txt")):
+        with open(txt_path, "r", encoding="utf-8") as f:
+            meta = scoping.get_metadata_from_text(f)
+        doc_paths.append(
+            constants.DISCOVERED_DIR / meta.get("filename", f"{txt_path.stem}.doc"))
+    return doc_paths
+
+
+def load_manifest():
+    """Loads {name: {mtime_ns, size, hash}} from the previous run, if any."""
+    if not constants.THUMBNAILS_MANIFEST_PATH.exists():
+        return {}
+    with open(constants.THUMBNAILS_MANIFEST_PATH, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def write_contact_sheet(manifest):
+    """Writes a static HTML contact sheet of all rendered thumbnails."""
+    figures = []
+    for name in sorted(manifest):
+        digest = manifest[name]["hash"]
+        if not digest or not (constants.THUMBNAILS_CACHE_DIR / f"{digest}.jpg").exists():
+            continue
+        figures.append(
+            f'<figure><img loading="lazy" src="cache/{digest}.jpg" alt="">'
+            f"<figcaption>{html.escape(name)}</figcaption></figure>")
+
+    with open(constants.THUMBNAILS_CONTACT_SHEET_PATH, "w", encoding="utf-8") as f:
+        f.write(
+            "<!DOCTYPE html>\n<html><head><meta charset=\"utf-8\">"
+            "<title>Invoice Thumbnails</title><style>"
+            "body{font-family:sans-serif;display:flex;flex-wrap:wrap;gap:8px}"
+            "figure{margin:0;width:180px;text-align:center;font-size:12px}"
+            "img{max-width:180px;border:1px solid #ccc}"
+            "</style></head><body>\n")
+        f.write("\n".join(figures))
+        f.write("\n</body></html>\n")
+    return len(figures)
+
+
+def run_thumbnails(doc_paths=None, extract_workers=None, render_workers=4):
+    """Extracts, renders and indexes thumbnails for the given documents.
+
+    Args:
+        doc_paths: List of .doc paths to process (default: fully_scoped working set).
+        extract_workers: Number of extraction processes (default: CPU count).
+        render_workers: Maximum number of concurrent wmf2gd processes.
+    """
+    print("--- [ STAGE: THUMBNAILS ] ---")
+
+    if doc_paths is None:
+        if not constants.SCOPED_FULLY_SCOPED_DIR.exists():
+            print("Error: Fully scoped directory not found.")
+            return
+        doc_paths = get_in_scope_doc_paths()
+
+    constants.THUMBNAILS_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    previous = load_manifest()
+    manifest = {}
+    to_extract = []
+    missing_count = 0
+
+    # 1. Reuse the previous hash for documents whose signature is unchanged.
+    for doc_path in doc_paths:
+        if not doc_path.exists():
+            missing_count += 1
+            continue
+        stat = doc_path.stat()
+        entry = previous.get(doc_path.name)
+        if entry and (entry["mtime_ns"], entry["size"]) == (stat.st_mtime_ns, stat.st_size):
+            manifest[doc_path.name] = entry
+        else:
+            to_extract.append(doc_path)
+            manifest[doc_path.name] = {
+                "mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "hash": None}
+
+    print(f"Found {len(doc_paths)} documents "
+          f"({len(doc_paths) - missing_count - len(to_extract)} unchanged, "
+          f"{len(to_extract)} to extract).")
+
+    # 2. Extract thumbnails in parallel processes (olefile parsing is CPU-bound).
+    error_count = 0
+    if to_extract:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=extract_workers) as executor:
+            for name, digest, error in executor.map(_extract_task, to_extract, chunksize=16):
+                if error:
+                    # Dropped from this run's manifest so it is retried next time.
+                    print(f"FAILED: {name} (Error: {error})")
+                    del manifest[name]
+                    error_count += 1
+                else:
+                    manifest[name]["hash"] = digest
+
+    # 3. Render each distinct, not-yet-rendered thumbnail with bounded concurrency.
+    digests = {entry["hash"] for entry in manifest.values() if entry["hash"]}
+    to_render = sorted(
+        d for d in digests
+        if not (constants.THUMBNAILS_CACHE_DIR / f"{d}.jpg").exists())
+    print(f"{len(digests)} distinct thumbnails, {len(to_render)} to render.")
+
+    render_count = 0
+    render_error_count = 0
+    with concurrent.futures.ThreadPoolExecutor(max_workers=render_workers) as executor:
+        for success, info in executor.map(render_thumbnail, to_render):
+            if success:
+                render_count += 1
+                if render_count % 50 == 0:
+                    print(f"Progress: [{render_count}/{len(to_render)}] Rendered...")
+            else:
+                print(f"FAILED: {info}")
+                render_error_count += 1
+
+    # Merge so entries for documents outside this run are preserved.
+    previous.update(manifest)
+    with open(constants.THUMBNAILS_MANIFEST_PATH, "w", encoding="utf-8") as f:
+        json.dump(previous, f, indent=2, sort_keys=True)
+    sheet_count = write_contact_sheet(manifest)
+
+    print(f"Thumbnails Complete.")
+    print(f"Newly Rendered:           {render_count}")
+    print(f"Skipped (Cached):         {len(digests) - len(to_render)}")
+    print(f"No Thumbnail:             {sum(1 for e in manifest.values() if not e['hash'])}")
+    print(f"Contact Sheet:            {constants.THUMBNAILS_CONTACT_SHEET_PATH} "
+          f"({sheet_count} thumbnails)")
+    if missing_count > 0:
+        print(f"Missing Documents:        {missing_count}")
+    if error_count + render_error_count > 0:
+        print(f"Failed:                   {error_count + render_error_count}")
+    print("-" * 25)
+
+
+def main():
+    """Command line entry point for the thumbnail stage."""
+    parser = argparse.ArgumentParser(
+        description="Extract and render OLE2 thumbnails with a content-addressed cache.")
+    parser.add_argument("--source-dir", type=Path, default=None,
+                        help="Directory of .doc files (default: fully_scoped working set).")
+    parser.add_argument("--extract-workers", type=int, default=None,
+                        help="Number of extraction processes (default: CPU count).")
+    parser.add_argument("--render-workers", type=int, default=4,
+                        help="Maximum number of concurrent wmf2gd renders.")
+    args = parser.parse_args()
+
+    if args.source_dir is not None:
+        if not args.source_dir.is_dir():
+            parser.error(f"Source directory not found: {args.source_dir}")
+        doc_paths = sorted(
+            p for p in args.source_dir.iterdir()
+            if p.suffix.lower() == ".doc" and not p.name.startswith("~"))
+    elif not constants.SCOPED_FULLY_SCOPED_DIR.exists():
+        parser.error("Working set not found. Run the scoping stage or pass --source-dir.")
+    else:
+        doc_paths = None
+
+    run_thumbnails(doc_paths,
+                   extract_workers=args.extract_workers,
+                   render_workers=args.render_workers)